@@ -2,14 +2,14 @@
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
 from typing import List, Dict
-from app.services.nlp_service import NLPService
+from app.services.nlp_service import get_nlp_service
 
 router = APIRouter(
     prefix="/api/v1/advanced",
     tags=["advanced"],
 )
 
-nlp_service = NLPService()
+nlp_service = get_nlp_service()
 
 class TextAnalysisRequest(BaseModel):
     text: str
@@ -38,7 +38,7 @@ async def analyze_experience_level(request: TextAnalysisRequest) -> ExperienceLe
 async def extract_key_phrases(request: TextAnalysisRequest) -> KeyPhrasesResponse:
     """Extract key phrases from text."""
     try:
-        phrases = nlp_service.extract_key_phrases(request.text)
+        phrases = await nlp_service.a_extract_key_phrases(request.text)
         result = [{"phrase": p[0], "score": p[1]} for p in phrases]
         return KeyPhrasesResponse(phrases=result)
     except Exception as e:
@@ -6,8 +6,8 @@ from typing import Optional
 from app.core.database import get_db
 from app.core.auth import get_current_active_user
 from app.models.user import User
-from app.services.ai_insights import AIInsightsEngine
-from app.services.optimization import ResumeOptimizer
+from app.services.ai_insights import AIInsightsEngine, get_insights_engine
+from app.services.optimization import ResumeOptimizer, get_resume_optimizer
 
 router = APIRouter(
     prefix="/api/v1/insights",
@@ -27,11 +27,10 @@ class OptimizationRequest(BaseModel):
 async def generate_insights(
     request: InsightsRequest,
     current_user: Optional[User] = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    insights_engine: AIInsightsEngine = Depends(get_insights_engine)
 ):
     """Generate AI-powered insights."""
-    insights_engine = AIInsightsEngine()
-    
     user_id = current_user.id if current_user else None
     
     insights = insights_engine.generate_insights(
@@ -50,11 +49,10 @@ async def generate_insights(
 @router.post("/optimize")
 async def optimize_resume(
     request: OptimizationRequest,
-    current_user: Optional[User] = Depends(get_current_active_user)
+    current_user: Optional[User] = Depends(get_current_active_user),
+    optimizer: ResumeOptimizer = Depends(get_resume_optimizer)
 ):
     """Generate resume optimization suggestions."""
-    optimizer = ResumeOptimizer()
-    
     suggestions = optimizer.optimize_resume(
         resume_text=request.resume_text,
         job_description=request.job_description
@@ -68,11 +66,10 @@ async def optimize_resume(
 @router.get("/industry-benchmarks/{role}")
 async def get_industry_benchmarks(
     role: str,
-    current_user: Optional[User] = Depends(get_current_active_user)
+    current_user: Optional[User] = Depends(get_current_active_user),
+    insights_engine: AIInsightsEngine = Depends(get_insights_engine)
 ):
     """Get industry benchmarks for a role."""
-    insights_engine = AIInsightsEngine()
-    
     benchmark = insights_engine.industry_benchmarks.get(role)
     
     if not benchmark:
@@ -87,10 +84,8 @@ async def get_industry_benchmarks(
     }
 
 @router.get("/available-roles")
-async def get_available_roles():
+async def get_available_roles(insights_engine: AIInsightsEngine = Depends(get_insights_engine)):
     """Get list of roles with available benchmarks."""
-    insights_engine = AIInsightsEngine()
-    
     return {
         "roles": list(insights_engine.industry_benchmarks.keys())
     }
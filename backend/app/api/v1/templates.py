@@ -1,17 +1,22 @@
 """Resume template API endpoints."""
+import re
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import HTMLResponse, PlainTextResponse
 from typing import Optional
 from pydantic import BaseModel, Field
 from app.core.auth import get_current_active_user
 from app.models.user import User
-from app.services.resume_templates import TemplateManager
+from app.services.resume_templates import TemplateManager, get_template_manager
 
 router = APIRouter(
     prefix="/api/v1/templates",
     tags=["templates"],
 )
 
+# Contact details pulled out of pasted resume text
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}')
+
 class ResumeData(BaseModel):
     name: str = Field(..., example="John Doe")
     email: str = Field(..., example="john@example.com")
@@ -23,9 +28,8 @@ class ResumeData(BaseModel):
     education: list = Field(default_factory=list)
 
 @router.get("/list")
-async def list_templates():
+async def list_templates(manager: TemplateManager = Depends(get_template_manager)):
     """List available resume templates."""
-    manager = TemplateManager()
     return {
         "templates": manager.list_templates()
     }
@@ -35,11 +39,10 @@ async def generate_resume(
     template_name: str,
     data: ResumeData,
     format: str = "html",
-    current_user: Optional[User] = Depends(get_current_active_user)
+    current_user: Optional[User] = Depends(get_current_active_user),
+    manager: TemplateManager = Depends(get_template_manager)
 ):
     """Generate resume using specified template."""
-    manager = TemplateManager()
-    
     if template_name not in ["modern", "ats"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,12 +79,12 @@ async def parse_to_template(
     current_user: Optional[User] = Depends(get_current_active_user)
 ):
     """Parse resume text and extract structured data for templates."""
-    from app.services.nlp_service import NLPService
+    from app.services.nlp_service import get_nlp_service
     
-    nlp_service = NLPService()
+    nlp_service = get_nlp_service()
     
     # Extract structured data from resume text
-    skills = nlp_service.extract_skills_advanced(resume_text)
+    skills = await nlp_service.a_extract_skills_advanced(resume_text)
     
     # Basic parsing (this could be enhanced with more sophisticated NLP)
     lines = resume_text.split('\n')
@@ -90,14 +93,11 @@ async def parse_to_template(
     name = next((line.strip() for line in lines if line.strip()), "Your Name")
     
     # Extract email
-    import re
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, resume_text)
+    email_match = _EMAIL_RE.search(resume_text)
     email = email_match.group(0) if email_match else "email@example.com"
     
     # Extract phone
-    phone_pattern = r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}'
-    phone_match = re.search(phone_pattern, resume_text)
+    phone_match = _PHONE_RE.search(resume_text)
     phone = phone_match.group(0) if phone_match else "123-456-7890"
     
     return {
@@ -1,22 +1,26 @@
 """File upload endpoints."""
 from fastapi import APIRouter, File, UploadFile, HTTPException, status, Depends
+from fastapi.responses import ORJSONResponse
 from typing import Optional
-from app.services.pdf_parser import DocumentProcessor, PDFParser
+from app.services.pdf_parser import DocumentProcessor, get_document_processor, get_pdf_parser
 from app.core.auth import get_current_active_user
 from app.models.user import User
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Responses carry the full extracted document text, so serialize with orjson
 router = APIRouter(
     prefix="/api/v1/upload",
     tags=["upload"],
+    default_response_class=ORJSONResponse,
 )
 
 @router.post("/resume")
 async def upload_resume(
     file: UploadFile = File(...),
-    current_user: Optional[User] = Depends(get_current_active_user)
+    current_user: Optional[User] = Depends(get_current_active_user),
+    processor: DocumentProcessor = Depends(get_document_processor)
 ):
     """Upload and parse resume document."""
     
@@ -28,7 +32,6 @@ async def upload_resume(
         )
     
     # Check file type
-    processor = DocumentProcessor()
     if not processor.is_supported_format(file.content_type):
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
@@ -51,8 +54,7 @@ async def upload_resume(
         
         # Validate if it's a resume (but don't fail if it's not)
         if file.content_type == 'application/pdf':
-            parser = PDFParser()
-            validation = parser.validate_resume_content(extracted_text)
+            validation = get_pdf_parser().validate_resume_content(extracted_text)
             
             if not validation["is_valid"]:
                 logger.warning(f"Document may not be a resume: {validation['issues']}")
@@ -78,7 +80,8 @@ async def upload_resume(
 @router.post("/job-description")
 async def upload_job_description(
     file: UploadFile = File(...),
-    current_user: Optional[User] = Depends(get_current_active_user)
+    current_user: Optional[User] = Depends(get_current_active_user),
+    processor: DocumentProcessor = Depends(get_document_processor)
 ):
     """Upload and parse job description document."""
     
@@ -89,7 +92,6 @@ async def upload_job_description(
             detail="File size exceeds 5MB limit"
         )
     
-    processor = DocumentProcessor()
     if not processor.is_supported_format(file.content_type):
         raise HTTPException(
             status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
@@ -0,0 +1,64 @@
+"""Request body size limits for upload endpoints."""
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Multipart framing (boundaries, part headers) on top of the file itself
+_MULTIPART_OVERHEAD = 64 * 1024
+
+# Largest body accepted per upload route, matching the per-file limits
+UPLOAD_BODY_LIMITS = {
+    "/api/v1/upload/resume": 10 * 1024 * 1024 + _MULTIPART_OVERHEAD,
+    "/api/v1/upload/job-description": 5 * 1024 * 1024 + _MULTIPART_OVERHEAD,
+}
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized uploads while the body streams in.
+    
+    The multipart parser spools the whole body before the route runs, so the
+    route's own size check only fires once an oversized file has already been
+    read. Counting bytes as they arrive stops the upload at the limit instead.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        limit = UPLOAD_BODY_LIMITS.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+        
+        too_large = JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": "Upload exceeds the size limit"}
+        )
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > limit:
+            await too_large(scope, receive, send)
+            return
+        
+        received = 0
+        rejected = False
+        
+        async def receive_limited() -> Message:
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Answer now and let the app see a client disconnect, so
+                    # it stops reading; whatever it responds with is dropped
+                    rejected = True
+                    await too_large(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+        
+        async def send_unless_rejected(message: Message):
+            if not rejected:
+                await send(message)
+        
+        await self.app(scope, receive_limited, send_unless_rejected)
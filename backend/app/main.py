@@ -30,6 +30,7 @@ from app.core.rate_limiter import limiter, rate_limit_exceeded_handler
 
 # Import monitoring
 from app.core.monitoring import PerformanceMiddleware, get_system_metrics
+from app.core.upload_limits import UploadSizeLimitMiddleware
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,6 +47,10 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Cap upload bodies while they stream in; added before CORS so its 413
+# responses still carry the CORS headers
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # Configure CORS - Allow all origins for now
 app.add_middleware(
     CORSMiddleware,
@@ -155,6 +160,10 @@ async def startup_event():
 async def shutdown_event():
     """Run shutdown tasks."""
     logger.info("Shutting down SkillSync Pro API...")
+    
+    # Close pooled SMTP connections
+    from app.services.email_service import email_service
+    await email_service.close()
 
 # Add these imports at the top
 from app.api.v1.upload import router as upload_router
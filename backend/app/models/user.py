@@ -1,5 +1,5 @@
 """User database models."""
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -15,7 +15,7 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationship to analysis history
@@ -33,7 +33,12 @@ class AnalysisHistory(Base):
     match_percentage = Column(Float, nullable=False)
     skill_analysis = Column(JSON, nullable=False)
     recommendations = Column(JSON)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Relationship to user
     user = relationship("User", back_populates="analyses")
+    
+    __table_args__ = (
+        # Per-user recent history, newest first
+        Index("ix_analysis_history_user_created", "user_id", created_at.desc()),
+    )
@@ -4,7 +4,8 @@ from datetime import datetime, timedelta
 import json
 import re
 from collections import Counter
-from app.services.nlp_service import NLPService
+from functools import lru_cache
+from app.services.nlp_service import get_nlp_service
 from sqlalchemy.orm import Session
 from app.models.user import AnalysisHistory
 import numpy as np
@@ -13,7 +14,7 @@ class AIInsightsEngine:
     """Generate AI-powered insights and predictions."""
     
     def __init__(self):
-        self.nlp_service = NLPService()
+        self.nlp_service = get_nlp_service()
         
         # Industry benchmarks (these would ideally come from a database)
         self.industry_benchmarks = {
@@ -319,3 +320,8 @@ class AIInsightsEngine:
             return "Nearly ready - Minor improvements recommended"
         else:
             return "Preparation needed - Focus on skill development"
+
+@lru_cache(maxsize=1)
+def get_insights_engine() -> AIInsightsEngine:
+    """Shared AIInsightsEngine instance."""
+    return AIInsightsEngine()
@@ -1,8 +1,9 @@
 """Main analysis service that orchestrates the resume analysis."""
 import time
-from typing import Dict, Any, Set, List
+from functools import lru_cache
+from typing import Dict, Any, Set, List, Optional, Callable, Awaitable
 from app.services.text_processor import TextProcessor, SkillMatcher
-from app.services.nlp_service import NLPService
+from app.services.nlp_service import get_nlp_service
 from app.services.embeddings_service import EmbeddingsService
 from app.models.analysis import (
     ResumeAnalysisRequest,
@@ -14,30 +15,69 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+SKILL_CATEGORIES = {
+    'Programming': ['python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'go', 'rust', 'php', 'typescript'],
+    'Frontend': ['react', 'angular', 'vue', 'html', 'css', 'sass', 'tailwind', 'bootstrap'],
+    'Backend': ['node.js', 'express', 'django', 'flask', 'fastapi', 'spring', 'rails'],
+    'Database': ['sql', 'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch'],
+    'Cloud/DevOps': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform'],
+    'Data/AI': ['machine-learning', 'deep-learning', 'tensorflow', 'pytorch', 'pandas', 'numpy'],
+    'Tools': ['git', 'jira', 'confluence', 'linux', 'agile', 'scrum']
+}
+
+@lru_cache(maxsize=4096)
+def _match_skill_category(skill_lower: str) -> str:
+    """Return the first category with a keyword contained in the skill."""
+    for category, skills in SKILL_CATEGORIES.items():
+        if any(s in skill_lower for s in skills):
+            return category
+    return 'Other'
+
+# The category table is fixed, so resolve every listed keyword up front;
+# the common case becomes a single dict lookup.
+_KNOWN_SKILL_CATEGORIES = {
+    s: _match_skill_category(s)
+    for skills in SKILL_CATEGORIES.values()
+    for s in skills
+}
+
 class ResumeAnalyzer:
     """Main service for analyzing resumes against job descriptions."""
     
     def __init__(self):
         self.text_processor = TextProcessor()
         self.skill_matcher = SkillMatcher()
-        self.nlp_service = NLPService()
+        self.nlp_service = get_nlp_service()
         self.embeddings_service = EmbeddingsService()
     
-    async def analyze(self, request: ResumeAnalysisRequest) -> AnalysisResponse:
-        """Perform complete analysis of resume against job description."""
+    async def analyze(
+        self,
+        request: ResumeAnalysisRequest,
+        progress_cb: Optional[Callable[[str, int], Awaitable[None]]] = None
+    ) -> AnalysisResponse:
+        """Perform complete analysis of resume against job description.
+        
+        If ``progress_cb`` is given it is awaited with ``(stage, progress)``
+        as the pipeline advances, so callers can stream progress updates.
+        """
         start_time = time.time()
         
         try:
             # Clean texts
+            if progress_cb:
+                await progress_cb("Cleaning text", 20)
             clean_resume = self.text_processor.clean_text(request.resume_text)
             clean_jd = self.text_processor.clean_text(request.job_description)
             
             # Extract skills using both methods
+            if progress_cb:
+                await progress_cb("Extracting skills", 40)
             basic_resume_skills = self.text_processor.extract_keywords(clean_resume)
             basic_jd_skills = self.text_processor.extract_keywords(clean_jd)
             
-            nlp_resume_skills = self.nlp_service.extract_skills_advanced(request.resume_text)
-            nlp_jd_skills = self.nlp_service.extract_skills_advanced(request.job_description)
+            nlp_resume_skills, nlp_jd_skills = await self.nlp_service.a_extract_skills_batch(
+                [request.resume_text, request.job_description]
+            )
             
             # Combine both approaches
             resume_skills = basic_resume_skills.union(nlp_resume_skills)
@@ -48,6 +88,8 @@ class ResumeAnalyzer:
             jd_level = self.nlp_service.extract_experience_level(request.job_description)
             
             # Calculate match score
+            if progress_cb:
+                await progress_cb("Matching skills", 60)
             skill_match_score = self.skill_matcher.calculate_match_score(resume_skills, jd_skills)
             
             # Experience level bonus
@@ -58,9 +100,9 @@ class ResumeAnalyzer:
                 level_bonus = 5
             
             # Semantic similarity
-            semantic_score = self.nlp_service.calculate_semantic_similarity(
-                request.resume_text[:1000], 
-                request.job_description[:1000]
+            semantic_score = await self.nlp_service.a_calculate_semantic_similarity(
+                request.resume_text,
+                request.job_description
             ) * 100
             
             # Final score
@@ -73,41 +115,40 @@ class ResumeAnalyzer:
             # Analyze market demand for skills
             all_skills = list(resume_skills.union(jd_skills))
             demand_analysis = self.embeddings_service.analyze_skill_market_demand(all_skills)
-            
-            # Create skill objects with AI-enhanced relevance
-            matching_skills = []
-            for skill in categorized['matching']:
-                relevance = 0.9 if demand_analysis.get(skill, "Standard") == "High" else 0.7
-                matching_skills.append(
-                    Skill(
-                        name=skill,
-                        category=self._categorize_skill(skill),
-                        relevance_score=relevance
-                    )
+            high_demand = {s for s, demand in demand_analysis.items() if demand == "High"}
+            
+            # Create skill objects with AI-enhanced relevance. Values are
+            # produced internally, so skip per-field validation.
+            matching_skills = [
+                Skill.model_construct(
+                    name=skill,
+                    category=self._categorize_skill(skill),
+                    relevance_score=0.9 if skill in high_demand else 0.7
                 )
-            
-            skill_gaps = []
-            for skill in categorized['gaps']:
-                relevance = 0.8 if demand_analysis.get(skill, "Standard") == "High" else 0.6
-                skill_gaps.append(
-                    Skill(
-                        name=skill,
-                        category=self._categorize_skill(skill),
-                        relevance_score=relevance
-                    )
+                for skill in categorized['matching']
+            ]
+            
+            skill_gaps = [
+                Skill.model_construct(
+                    name=skill,
+                    category=self._categorize_skill(skill),
+                    relevance_score=0.8 if skill in high_demand else 0.6
                 )
-            
-            unique_skills = []
-            for skill in categorized['unique']:
-                unique_skills.append(
-                    Skill(
-                        name=skill,
-                        category=self._categorize_skill(skill),
-                        relevance_score=0.5
-                    )
+                for skill in categorized['gaps']
+            ]
+            
+            unique_skills = [
+                Skill.model_construct(
+                    name=skill,
+                    category=self._categorize_skill(skill),
+                    relevance_score=0.5
                 )
+                for skill in categorized['unique']
+            ]
             
             # Generate AI-powered recommendations
+            if progress_cb:
+                await progress_cb("Generating recommendations", 80)
             skill_recommendations = self.embeddings_service.get_skill_recommendations(
                 categorized['gaps'],
                 categorized['unique']
@@ -179,21 +220,9 @@ class ResumeAnalyzer:
     
     def _categorize_skill(self, skill: str) -> str:
         """Categorize a skill into a category."""
-        categories = {
-            'Programming': ['python', 'javascript', 'java', 'c++', 'c#', 'ruby', 'go', 'rust', 'php', 'typescript'],
-            'Frontend': ['react', 'angular', 'vue', 'html', 'css', 'sass', 'tailwind', 'bootstrap'],
-            'Backend': ['node.js', 'express', 'django', 'flask', 'fastapi', 'spring', 'rails'],
-            'Database': ['sql', 'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch'],
-            'Cloud/DevOps': ['aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'terraform'],
-            'Data/AI': ['machine-learning', 'deep-learning', 'tensorflow', 'pytorch', 'pandas', 'numpy'],
-            'Tools': ['git', 'jira', 'confluence', 'linux', 'agile', 'scrum']
-        }
-        
         skill_lower = skill.lower()
-        for category, skills in categories.items():
-            if any(s in skill_lower for s in skills):
-                return category
-        return 'Other'
+        category = _KNOWN_SKILL_CATEGORIES.get(skill_lower)
+        return category if category is not None else _match_skill_category(skill_lower)
 
     async def analyze_with_updates(self, request: ResumeAnalysisRequest, client_id: str = None):
         """Perform analysis with real-time updates."""
@@ -214,22 +243,8 @@ class ResumeAnalyzer:
         # Send progress updates
         await send_update("Starting analysis", 0)
         
-        # Text cleaning
-        await send_update("Cleaning text", 20)
-        clean_resume = self.text_processor.clean_text(request.resume_text)
-        clean_jd = self.text_processor.clean_text(request.job_description)
-        
-        # Skill extraction
-        await send_update("Extracting skills", 40)
-        resume_skills = self.nlp_service.extract_skills_advanced(request.resume_text)
-        jd_skills = self.nlp_service.extract_skills_advanced(request.job_description)
-        
-        # Matching
-        await send_update("Matching skills", 60)
-        result = await self.analyze(request)
-        
-        # Generating recommendations
-        await send_update("Generating recommendations", 80)
+        # The analysis pipeline reports its own intermediate stages
+        result = await self.analyze(request, progress_cb=send_update)
         
         # Complete
         await send_update("Analysis complete", 100)
@@ -24,15 +24,14 @@ class CacheService:
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache."""
-        if key in self.cache:
-            entry = self.cache[key]
-            if time.time() < entry["expires"]:
+        entry = self.cache.get(key)
+        if entry is not None:
+            if time.monotonic() < entry["expires"]:
                 self.hits += 1
                 logger.debug(f"Cache hit: {key}")
                 return entry["value"]
-            else:
-                # Expired
-                del self.cache[key]
+            # Expired; a concurrent get may already have dropped it
+            self.cache.pop(key, None)
         
         self.misses += 1
         logger.debug(f"Cache miss: {key}")
@@ -43,10 +42,14 @@ class CacheService:
         ttl = ttl or self.default_ttl
         self.cache[key] = {
             "value": value,
-            "expires": time.time() + ttl
+            "expires": time.monotonic() + ttl
         }
         logger.debug(f"Cache set: {key}, TTL: {ttl}")
     
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache if present."""
+        self.cache.pop(key, None)
+    
     def clear(self) -> None:
         """Clear all cache entries."""
         self.cache.clear()
@@ -1,8 +1,10 @@
 """Collaborative session management."""
-from typing import Any, Dict, Set, Optional
+from typing import Any, Callable, Dict, Set, Optional
 from datetime import datetime, timedelta
+import asyncio
 import uuid
 import json
+from sortedcontainers import SortedList
 from app.core.websocket import manager
 import logging
 
@@ -11,7 +13,12 @@ logger = logging.getLogger(__name__)
 class CollaborationSession:
     """Represents a collaborative analysis session."""
     
-    def __init__(self, session_id: str, owner_id: int):
+    def __init__(
+        self,
+        session_id: str,
+        owner_id: int,
+        on_activity: Optional[Callable[["CollaborationSession", datetime], None]] = None
+    ):
         self.session_id = session_id
         self.owner_id = owner_id
         self.participants: Set[int] = {owner_id}
@@ -21,16 +28,24 @@ class CollaborationSession:
         self.last_activity = datetime.now()
         self.analysis_result = None
         self.is_active = True
+        self._on_activity = on_activity
+    
+    def _touch(self):
+        """Record activity and notify the owning manager."""
+        previous = self.last_activity
+        self.last_activity = datetime.now()
+        if self._on_activity:
+            self._on_activity(self, previous)
     
     def add_participant(self, user_id: int):
         """Add a participant to the session."""
         self.participants.add(user_id)
-        self.last_activity = datetime.now()
+        self._touch()
     
     def remove_participant(self, user_id: int):
         """Remove a participant from the session."""
         self.participants.discard(user_id)
-        self.last_activity = datetime.now()
+        self._touch()
     
     def update_content(self, field: str, content: str, user_id: int):
         """Update session content."""
@@ -38,7 +53,7 @@ class CollaborationSession:
             self.resume_text = content
         elif field == "job_description":
             self.job_description = content
-        self.last_activity = datetime.now()
+        self._touch()
         return True
     
     def to_dict(self):
@@ -60,13 +75,21 @@ class CollaborationManager:
     def __init__(self):
         self.sessions: Dict[str, CollaborationSession] = {}
         self.user_sessions: Dict[int, Set[str]] = {}
+        # (last_activity, session_id) pairs, oldest first
+        self._by_activity = SortedList()
+    
+    def _reindex(self, session: CollaborationSession, previous: datetime):
+        """Move a session to its new position in the activity index."""
+        self._by_activity.discard((previous, session.session_id))
+        self._by_activity.add((session.last_activity, session.session_id))
     
     def create_session(self, owner_id: int) -> CollaborationSession:
         """Create a new collaborative session."""
         session_id = str(uuid.uuid4())
-        session = CollaborationSession(session_id, owner_id)
+        session = CollaborationSession(session_id, owner_id, on_activity=self._reindex)
         
         self.sessions[session_id] = session
+        self._by_activity.add((session.last_activity, session_id))
         
         if owner_id not in self.user_sessions:
             self.user_sessions[owner_id] = set()
@@ -126,27 +149,31 @@ class CollaborationManager:
         if not session:
             return
         
-        for user_id in session.participants:
-            if user_id != exclude_user:
-                await manager.send_user_message(
-                    json.dumps(message),
-                    user_id
-                )
+        # Serialize once and send to everyone concurrently; one dead socket
+        # must not abort delivery to the rest of the session.
+        payload = json.dumps(message)
+        recipients = [user_id for user_id in session.participants if user_id != exclude_user]
+        results = await asyncio.gather(
+            *(manager.send_user_message(payload, user_id) for user_id in recipients),
+            return_exceptions=True
+        )
+        for user_id, result in zip(recipients, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to send to user {user_id} in session {session_id}: {result}")
     
     def cleanup_inactive_sessions(self, timeout_hours: int = 24):
         """Clean up inactive sessions."""
         cutoff_time = datetime.now() - timedelta(hours=timeout_hours)
-        sessions_to_close = []
-        
-        for session_id, session in self.sessions.items():
-            if session.last_activity < cutoff_time:
-                sessions_to_close.append(session_id)
+        closed = 0
         
-        for session_id in sessions_to_close:
+        # Expired sessions form a prefix of the activity index
+        while self._by_activity and self._by_activity[0][0] < cutoff_time:
+            _, session_id = self._by_activity.pop(0)
             self.close_session(session_id)
             del self.sessions[session_id]
+            closed += 1
         
-        return len(sessions_to_close)
+        return closed
 
 # Global collaboration manager
 collaboration_manager = CollaborationManager()
@@ -1,7 +1,13 @@
 """Email notification service."""
-from typing import List, Optional, Dict, Any
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+from typing import List, Optional, Dict, Any, Tuple
+from email.message import EmailMessage
+from email.utils import formataddr
+from fastapi_mail import ConnectionConfig
 from pydantic import EmailStr, BaseModel
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+import aiosmtplib
+import asyncio
+import html
 import os
 from datetime import datetime
 import logging
@@ -22,11 +28,125 @@ conf = ConnectionConfig(
     VALIDATE_CERTS=True
 )
 
+# Number of SMTP connections kept open, and messages sent on one socket
+# before it is recycled (providers throttle long-lived sessions)
+MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", "2"))
+MAIL_MAX_MESSAGES_PER_CONNECTION = int(os.getenv("MAIL_MAX_MESSAGES_PER_CONNECTION", "100"))
+
+# Bulk sends go out in concurrent slabs and give up once a third of at
+# least this many attempts have failed
+BULK_SLAB_SIZE = 10
+BULK_ABORT_MIN_ATTEMPTS = 30
+
+WEEKLY_SUMMARY_SUBJECT = "Your Weekly SkillSync Pro Summary"
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "email_templates")
+EMAIL_TEMPLATES = ("welcome", "analysis_complete", "weekly_summary")
+
+# Stands in for the username in the pre-rendered welcome email
+USERNAME_PLACEHOLDER = "__USERNAME__"
+
+class SMTPConnection:
+    """A long-lived SMTP client that reconnects lazily."""
+    
+    def __init__(self):
+        self.smtp = aiosmtplib.SMTP(
+            hostname=conf.MAIL_SERVER,
+            port=conf.MAIL_PORT,
+            use_tls=conf.MAIL_SSL_TLS,
+            start_tls=conf.MAIL_STARTTLS,
+            validate_certs=conf.VALIDATE_CERTS,
+            timeout=conf.TIMEOUT
+        )
+        self.messages_sent = 0
+    
+    async def _ensure_connection(self):
+        """Connect and authenticate if needed, recycling worn-out sockets."""
+        if self.smtp.is_connected and self.messages_sent >= MAIL_MAX_MESSAGES_PER_CONNECTION:
+            await self.close()
+        
+        if not self.smtp.is_connected:
+            await self.smtp.connect()
+            if conf.USE_CREDENTIALS:
+                await self.smtp.login(conf.MAIL_USERNAME, conf.MAIL_PASSWORD)
+            self.messages_sent = 0
+    
+    async def send(self, message: EmailMessage):
+        """Send a message, reconnecting once if the server dropped us."""
+        await self._ensure_connection()
+        try:
+            await self.smtp.send_message(message)
+        except aiosmtplib.SMTPServerDisconnected:
+            await self.close()
+            await self._ensure_connection()
+            await self.smtp.send_message(message)
+        self.messages_sent += 1
+    
+    async def close(self):
+        """Close the underlying socket."""
+        if self.smtp.is_connected:
+            try:
+                await self.smtp.quit()
+            except aiosmtplib.SMTPException:
+                self.smtp.close()
+        self.messages_sent = 0
+
+class SMTPConnectionPool:
+    """Fixed-size pool of SMTP connections shared across sends."""
+    
+    def __init__(self, size: int = MAIL_POOL_SIZE):
+        self.connections = [SMTPConnection() for _ in range(max(1, size))]
+        self._available: asyncio.Queue = asyncio.Queue()
+        for connection in self.connections:
+            self._available.put_nowait(connection)
+    
+    async def send(self, message: EmailMessage):
+        """Send a message on the next free connection."""
+        connection = await self._available.get()
+        try:
+            await connection.send(message)
+        except Exception:
+            # Connection state is unknown after a failure; start fresh next time
+            await connection.close()
+            raise
+        finally:
+            self._available.put_nowait(connection)
+    
+    async def close(self):
+        """Close every connection in the pool."""
+        for connection in self.connections:
+            await connection.close()
+
 class EmailService:
     """Service for sending email notifications."""
     
     def __init__(self):
-        self.fm = FastMail(conf) if conf.MAIL_PASSWORD else None
+        self.enabled = bool(conf.MAIL_PASSWORD)
+        self.pool = SMTPConnectionPool() if self.enabled else None
+        
+        # Compile every template once at startup; they never change at runtime
+        self.env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=select_autoescape(["html", "j2"]),
+            auto_reload=False,
+            cache_size=-1
+        )
+        self.templates = {
+            name: self.env.get_template(f"{name}.html.j2")
+            for name in EMAIL_TEMPLATES
+        }
+        
+        # The welcome email only varies by username, so render it once
+        self.welcome_html = self.templates["welcome"].render(username=USERNAME_PLACEHOLDER)
+    
+    def _build_message(self, email: str, subject: str, body: str) -> EmailMessage:
+        """Build an HTML email message."""
+        message = EmailMessage()
+        message["From"] = formataddr((conf.MAIL_FROM_NAME, conf.MAIL_FROM))
+        message["To"] = email
+        message["Subject"] = subject
+        message.set_content(body, subtype="html")
+        return message
     
     async def send_email(
         self,
@@ -36,58 +156,61 @@ class EmailService:
         template_name: Optional[str] = None
     ) -> bool:
         """Send an email."""
-        if not self.fm:
+        if not self.pool:
             logger.warning("Email service not configured")
             return False
         
         try:
-            message = MessageSchema(
-                subject=subject,
-                recipients=[email],
-                body=body,
-                subtype=MessageType.html
-            )
-            
-            await self.fm.send_message(message)
-            logger.info(f"Email sent to {email}: {subject}")
+            await self.pool.send(self._build_message(email, subject, body))
+            logger.info("Email sent to %s: %s", email, subject)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to send email: {e}")
+            logger.error("Failed to send email: %s", e)
             return False
     
+    async def send_bulk(self, messages: List[Tuple[str, str, str]]) -> List[bool]:
+        """Send many ``(email, subject, body)`` messages over the pooled connections.
+        
+        Messages go out in concurrent slabs. Once enough sends have been
+        attempted and at least a third of them failed, the server or the
+        credentials are assumed broken and the remaining messages are skipped.
+        """
+        results = [False] * len(messages)
+        if not self.pool:
+            logger.warning("Email service not configured")
+            return results
+        
+        attempts = failures = 0
+        for start in range(0, len(messages), BULK_SLAB_SIZE):
+            if attempts >= BULK_ABORT_MIN_ATTEMPTS and failures * 3 >= attempts:
+                logger.error(
+                    "Aborting bulk send: %d/%d failed, %d messages skipped",
+                    failures, attempts, len(messages) - attempts
+                )
+                break
+            
+            slab = messages[start:start + BULK_SLAB_SIZE]
+            sent = await asyncio.gather(*(self.send_email(*message) for message in slab))
+            results[start:start + len(slab)] = sent
+            attempts += len(slab)
+            failures += sent.count(False)
+        
+        return results
+    
+    async def close(self):
+        """Close pooled SMTP connections."""
+        if self.pool:
+            await self.pool.close()
+    
     async def send_welcome_email(self, email: str, username: str) -> bool:
         """Send welcome email to new user."""
+        if not self.enabled:
+            logger.debug("Email disabled, skipping")
+            return False
+        
         subject = "Welcome to SkillSync Pro!"
-        body = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #4F46E5;">Welcome to SkillSync Pro, {username}!</h2>
-                    
-                    <p>Thank you for joining SkillSync Pro. We're excited to help you optimize your resume and land your dream job!</p>
-                    
-                    <h3>Here's what you can do:</h3>
-                    <ul>
-                        <li>📄 Analyze your resume against job descriptions</li>
-                        <li>📊 Get AI-powered insights and recommendations</li>
-                        <li>📈 Track your progress over time</li>
-                        <li>🎯 Optimize your resume for ATS systems</li>
-                    </ul>
-                    
-                    <p style="margin-top: 30px;">
-                        <a href="https://skillsyncpro.com/dashboard" style="background-color: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px;">
-                            Get Started
-                        </a>
-                    </p>
-                    
-                    <p style="margin-top: 30px; font-size: 12px; color: #666;">
-                        If you have any questions, feel free to reach out to our support team.
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        body = self.welcome_html.replace(USERNAME_PLACEHOLDER, html.escape(username))
         
         return await self.send_email(email, subject, body)
     
@@ -99,39 +222,16 @@ class EmailService:
         top_skills: List[str]
     ) -> bool:
         """Send email when analysis is complete."""
+        if not self.enabled:
+            logger.debug("Email disabled, skipping")
+            return False
+        
         subject = f"Your Resume Analysis is Ready - {match_percentage:.1f}% Match"
-        body = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #4F46E5;">Analysis Complete!</h2>
-                    
-                    <p>Hi {username},</p>
-                    
-                    <p>Your resume analysis is complete. Here's a quick summary:</p>
-                    
-                    <div style="background-color: #F3F4F6; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                        <h3 style="margin-top: 0;">Match Score: {match_percentage:.1f}%</h3>
-                        
-                        <h4>Top Matching Skills:</h4>
-                        <ul>
-                            {''.join(f'<li>{skill}</li>' for skill in top_skills[:5])}
-                        </ul>
-                    </div>
-                    
-                    <p>
-                        <a href="https://skillsyncpro.com/analysis" style="background-color: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px;">
-                            View Full Analysis
-                        </a>
-                    </p>
-                    
-                    <p style="margin-top: 30px; font-size: 12px; color: #666;">
-                        This is an automated notification. Please do not reply to this email.
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        body = self.templates["analysis_complete"].render(
+            username=username,
+            match_percentage=match_percentage,
+            top_skills=top_skills
+        )
         
         return await self.send_email(email, subject, body)
     
@@ -142,38 +242,31 @@ class EmailService:
         stats: Dict[str, Any]
     ) -> bool:
         """Send weekly summary email."""
-        subject = "Your Weekly SkillSync Pro Summary"
-        body = f"""
-        <html>
-            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
-                    <h2 style="color: #4F46E5;">Weekly Summary</h2>
-                    
-                    <p>Hi {username},</p>
-                    
-                    <p>Here's your activity summary for the past week:</p>
-                    
-                    <div style="background-color: #F3F4F6; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                        <h4>📊 This Week's Stats:</h4>
-                        <ul>
-                            <li>Analyses performed: {stats.get('analyses_count', 0)}</li>
-                            <li>Average match score: {stats.get('avg_match', 0):.1f}%</li>
-                            <li>Best match: {stats.get('best_match', 0):.1f}%</li>
-                            <li>Skills improved: {stats.get('skills_improved', 0)}</li>
-                        </ul>
-                    </div>
-                    
-                    <p>Keep up the great work!</p>
-                    
-                    <p style="margin-top: 30px; font-size: 12px; color: #666;">
-                        You can manage your email preferences in your account settings.
-                    </p>
-                </div>
-            </body>
-        </html>
-        """
+        if not self.enabled:
+            logger.debug("Email disabled, skipping")
+            return False
         
-        return await self.send_email(email, subject, body)
+        return await self.send_email(
+            email, WEEKLY_SUMMARY_SUBJECT, self._render_weekly_summary(username, stats)
+        )
+    
+    async def weekly_summary_broadcast(
+        self,
+        users: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> List[bool]:
+        """Send the weekly summary to many ``(email, username, stats)`` recipients."""
+        if not self.enabled:
+            logger.debug("Email disabled, skipping")
+            return [False] * len(users)
+        
+        return await self.send_bulk([
+            (email, WEEKLY_SUMMARY_SUBJECT, self._render_weekly_summary(username, stats))
+            for email, username, stats in users
+        ])
+    
+    def _render_weekly_summary(self, username: str, stats: Dict[str, Any]) -> str:
+        """Render the weekly summary email body."""
+        return self.templates["weekly_summary"].render(username=username, stats=stats)
 
 # Global email service instance
 email_service = EmailService()
@@ -3,13 +3,93 @@ import numpy as np
 from typing import List, Dict, Tuple
 import pickle
 import os
+import re
+from functools import lru_cache
+import json
+import hashlib
 from pathlib import Path
 import logging
+import joblib
+import scipy.sparse
+import sklearn
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
 logger = logging.getLogger(__name__)
 
+# Curated learning paths for common skills
+LEARNING_PATHS = {
+    "docker": (
+        "Learn containerization basics",
+        "Practice with Docker commands",
+        "Understand Dockerfile and docker-compose",
+        "Deploy a multi-container application"
+    ),
+    "kubernetes": (
+        "Master Docker first",
+        "Learn Kubernetes concepts (pods, services)",
+        "Practice with kubectl",
+        "Deploy applications on a K8s cluster"
+    ),
+    "react": (
+        "Master JavaScript ES6+",
+        "Learn React fundamentals (components, props, state)",
+        "Understand hooks and lifecycle",
+        "Build a complete SPA project"
+    ),
+    "aws": (
+        "Start with AWS Free Tier",
+        "Learn core services (EC2, S3, RDS)",
+        "Understand IAM and security",
+        "Get AWS Certified Cloud Practitioner"
+    ),
+    "python": (
+        "Learn Python syntax and basics",
+        "Master data structures and algorithms",
+        "Explore frameworks (Django/FastAPI)",
+        "Build real-world projects"
+    )
+}
+
+# Keywords that mark a skill as in high or medium market demand
+HIGH_DEMAND_KEYWORDS = frozenset({
+    "cloud", "ai", "ml", "kubernetes", "docker", "react", "python",
+    "typescript", "aws", "data", "devops", "microservices"
+})
+
+MEDIUM_DEMAND_KEYWORDS = frozenset({
+    "java", "angular", "vue", "django", "flask", "postgresql",
+    "mongodb", "redis", "jenkins", "git"
+})
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Compile keywords into one substring alternation, longest first."""
+    return re.compile("|".join(map(re.escape, sorted(keywords, key=len, reverse=True))))
+
+_HIGH_DEMAND_RE = _keyword_pattern(HIGH_DEMAND_KEYWORDS)
+_MEDIUM_DEMAND_RE = _keyword_pattern(MEDIUM_DEMAND_KEYWORDS)
+
+# Services by embeddings version, so cached lookups can reach the fitted model
+_services: Dict[str, "EmbeddingsService"] = {}
+
+@lru_cache(maxsize=2048)
+def _similar_skills_cached(skill_lower: str, top_n: int, version: str) -> Tuple[Tuple[str, float], ...]:
+    """Similar skills for a normalized query, cached per embeddings version."""
+    return tuple(_services[version]._compute_similar_skills(skill_lower, top_n))
+
+@lru_cache(maxsize=1024)
+def _learning_path_cached(skill: str) -> Tuple[str, ...]:
+    """Learning path for a skill, specific when curated and generic otherwise."""
+    skill_lower = skill.lower()
+    if skill_lower in LEARNING_PATHS:
+        return LEARNING_PATHS[skill_lower]
+    return (
+        f"Research {skill} fundamentals",
+        f"Find online courses or tutorials for {skill}",
+        f"Practice with hands-on projects",
+        f"Join communities and contribute to open source"
+    )
+
 class EmbeddingsService:
     """Service for generating and managing skill embeddings using TF-IDF."""
     
@@ -21,21 +101,78 @@ class EmbeddingsService:
         self.cache_dir = Path("cache/embeddings")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize TF-IDF vectorizer
-        self.vectorizer = TfidfVectorizer(
+        # Initialize skill database
+        self.skill_database = self._initialize_skill_database()
+        self.skill_names = list(self.skill_database.keys())
+        self.skill_index = {name: idx for idx, name in enumerate(self.skill_names)}
+        
+        # Column-wise copies of the skill database for vectorized scans
+        self.skill_names_array = np.asarray(self.skill_names)
+        self.display_names_array = np.asarray([data["name"] for data in self.skill_database.values()])
+        self.descriptions_array = np.asarray([data["description"] for data in self.skill_database.values()])
+        
+        # Load the fitted vectorizer and skill matrix, fitting them on first run
+        all_descriptions = self.descriptions_array.tolist()
+        self.version = self._compute_version(all_descriptions)
+        self.vectorizer, self.skill_vectors = self._load_or_fit(all_descriptions)
+        
+        # The matrix is tiny (skills x 500 features), so a dense float32 copy
+        # keeps similarity scoring on a BLAS matmul instead of sparse dispatch
+        self.skill_matrix = np.ascontiguousarray(self.skill_vectors.toarray(), dtype=np.float32)
+        _services[self.version] = self
+        
+        logger.info("EmbeddingsService initialized successfully")
+    
+    def _create_vectorizer(self) -> TfidfVectorizer:
+        """Create an unfitted TF-IDF vectorizer."""
+        return TfidfVectorizer(
             max_features=500,
             stop_words='english',
             ngram_range=(1, 2)
         )
+    
+    def _compute_version(self, descriptions: List[str]) -> str:
+        """Hash the skill descriptions, vectorizer settings and library versions into a cache key.
         
-        # Initialize skill database
-        self.skill_database = self._initialize_skill_database()
+        The pickled vectorizer only loads reliably into the scikit-learn it was
+        written by, and the matrix into the same SciPy, so an upgrade refits.
+        """
+        params = self._create_vectorizer().get_params()
+        versions = {"sklearn": sklearn.__version__, "scipy": scipy.__version__}
+        payload = json.dumps([descriptions, params, versions], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    
+    def _load_or_fit(self, descriptions: List[str]):
+        """Load the vectorizer and skill matrix from disk, or fit and persist them."""
+        vectorizer_path = self.cache_dir / f"{self.version}.joblib"
+        vectors_path = self.cache_dir / f"{self.version}.npz"
         
-        # Fit vectorizer on all skills
-        all_descriptions = [data["description"] for data in self.skill_database.values()]
-        self.skill_vectors = self.vectorizer.fit_transform(all_descriptions)
+        if vectorizer_path.exists() and vectors_path.exists():
+            try:
+                vectorizer = joblib.load(vectorizer_path)
+                skill_vectors = scipy.sparse.load_npz(vectors_path)
+                logger.info(f"Loaded cached skill embeddings {self.version}")
+                return vectorizer, skill_vectors
+            except Exception as e:
+                logger.warning(f"Failed to load cached skill embeddings: {e}")
         
-        logger.info("EmbeddingsService initialized successfully")
+        vectorizer = self._create_vectorizer()
+        # Rows are stored unit-length so cosine similarity is a plain dot product
+        skill_vectors = normalize(vectorizer.fit_transform(descriptions), norm='l2', axis=1, copy=False)
+        
+        try:
+            # Write to temporary files first so concurrent workers never read a partial file
+            pid = os.getpid()
+            tmp_vectorizer = self.cache_dir / f"{self.version}.{pid}.tmp.joblib"
+            tmp_vectors = self.cache_dir / f"{self.version}.{pid}.tmp.npz"
+            joblib.dump(vectorizer, tmp_vectorizer)
+            scipy.sparse.save_npz(tmp_vectors, skill_vectors)
+            os.replace(tmp_vectorizer, vectorizer_path)
+            os.replace(tmp_vectors, vectors_path)
+        except OSError as e:
+            logger.warning(f"Failed to cache skill embeddings: {e}")
+        
+        return vectorizer, skill_vectors
     
     def _initialize_skill_database(self) -> Dict:
         """Initialize comprehensive skill database."""
@@ -126,50 +263,75 @@ class EmbeddingsService:
     
     def get_similar_skills(self, skill: str, top_n: int = 5) -> List[Tuple[str, float]]:
         """Find similar skills using TF-IDF similarity."""
-        skill_lower = skill.lower()
-        
-        # Create query vector
-        if skill_lower in self.skill_database:
-            query_text = self.skill_database[skill_lower]["description"]
-        else:
-            query_text = skill
+        return list(_similar_skills_cached(skill.lower().strip(), top_n, self.version))
+    
+    def _compute_similar_skills(self, skill_lower: str, top_n: int) -> List[Tuple[str, float]]:
+        """Rank skills by TF-IDF similarity to a normalized query."""
+        return self._compute_similar_skills_batch([skill_lower], top_n)[0]
+    
+    def _rank_similar_skills(self, skills_lower: List[str], 
+                             top_n: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Indices and scores of the closest skills for many normalized queries."""
+        if not skills_lower:
+            return []
         
-        query_vector = self.vectorizer.transform([query_text])
+        # Known skills are queried by their rich description
+        queries = [
+            self.descriptions_array[self.skill_index[skill]] if skill in self.skill_index else skill
+            for skill in skills_lower
+        ]
+        query_vectors = normalize(self.vectorizer.transform(queries), norm='l2', axis=1, copy=False)
+        query_matrix = query_vectors.toarray().astype(np.float32, copy=False)
         
-        # Calculate similarities
-        similarities = cosine_similarity(query_vector, self.skill_vectors).flatten()
+        # One similarity matrix for all queries, shape (queries, skills)
+        similarities = query_matrix @ self.skill_matrix.T
         
-        # Get top similar skills
-        skill_names = list(self.skill_database.keys())
-        similar_indices = similarities.argsort()[-top_n-1:][::-1]
+        # Partial sort: keep one extra candidate in case the query itself ranks first
+        k = min(top_n + 1, similarities.shape[1])
+        candidates = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
         
         results = []
-        for idx in similar_indices:
-            skill_name = skill_names[idx]
-            if skill_name != skill_lower:  # Don't include the skill itself
-                results.append((self.skill_database[skill_name]["name"], float(similarities[idx])))
+        for row, skill_lower in enumerate(skills_lower):
+            row_candidates = candidates[row]
+            ordered = row_candidates[np.argsort(-similarities[row, row_candidates], kind="stable")]
+            
+            # Don't include the skill itself
+            ordered = ordered[self.skill_names_array[ordered] != skill_lower][:top_n]
+            results.append((ordered, similarities[row, ordered]))
         
-        return results[:top_n]
+        return results
+    
+    def _compute_similar_skills_batch(self, skills_lower: List[str], 
+                                      top_n: int) -> List[List[Tuple[str, float]]]:
+        """Rank skills against many normalized queries with a single transform."""
+        return [
+            list(zip(self.display_names_array[indices].tolist(), scores.tolist()))
+            for indices, scores in self._rank_similar_skills(skills_lower, top_n)
+        ]
     
     def get_skill_recommendations(self, skill_gaps: List[str], 
                                  unique_skills: List[str]) -> List[Dict]:
         """Generate intelligent skill recommendations based on gaps and existing skills."""
         recommendations = []
         
-        for gap in skill_gaps[:10]:  # Limit to top 10 gaps
-            similar_skills = self.get_similar_skills(gap, top_n=3)
-            
+        gaps = skill_gaps[:10]  # Limit to top 10 gaps
+        ranked = self._rank_similar_skills([gap.lower().strip() for gap in gaps], top_n=3)
+        
+        # Which database skills the user already has
+        unique_lower = list({unique.lower() for unique in unique_skills})
+        user_has = np.isin(self.skill_names_array, unique_lower)
+        
+        for gap, (indices, scores) in zip(gaps, ranked):
             # Check if user has any similar skills
-            has_related = False
-            for unique in unique_skills:
-                if unique.lower() in [s[0].lower() for s in similar_skills]:
-                    has_related = True
-                    break
+            has_related = bool(user_has[indices].any())
             
             recommendation = {
                 "skill": gap,
                 "priority": "high" if not has_related else "medium",
-                "related_skills": [{"name": s[0], "similarity": s[1]} for s in similar_skills],
+                "related_skills": [
+                    {"name": name, "similarity": score}
+                    for name, score in zip(self.display_names_array[indices].tolist(), scores.tolist())
+                ],
                 "learning_path": self._generate_learning_path(gap)
             }
             recommendations.append(recommendation)
@@ -178,72 +340,17 @@ class EmbeddingsService:
     
     def _generate_learning_path(self, skill: str) -> List[str]:
         """Generate a learning path for a skill."""
-        skill_lower = skill.lower()
-        
-        # Define learning paths for common skills
-        learning_paths = {
-            "docker": [
-                "Learn containerization basics",
-                "Practice with Docker commands",
-                "Understand Dockerfile and docker-compose",
-                "Deploy a multi-container application"
-            ],
-            "kubernetes": [
-                "Master Docker first",
-                "Learn Kubernetes concepts (pods, services)",
-                "Practice with kubectl",
-                "Deploy applications on a K8s cluster"
-            ],
-            "react": [
-                "Master JavaScript ES6+",
-                "Learn React fundamentals (components, props, state)",
-                "Understand hooks and lifecycle",
-                "Build a complete SPA project"
-            ],
-            "aws": [
-                "Start with AWS Free Tier",
-                "Learn core services (EC2, S3, RDS)",
-                "Understand IAM and security",
-                "Get AWS Certified Cloud Practitioner"
-            ],
-            "python": [
-                "Learn Python syntax and basics",
-                "Master data structures and algorithms",
-                "Explore frameworks (Django/FastAPI)",
-                "Build real-world projects"
-            ]
-        }
-        
-        # Return specific path or generic one
-        if skill_lower in learning_paths:
-            return learning_paths[skill_lower]
-        else:
-            return [
-                f"Research {skill} fundamentals",
-                f"Find online courses or tutorials for {skill}",
-                f"Practice with hands-on projects",
-                f"Join communities and contribute to open source"
-            ]
+        return list(_learning_path_cached(skill))
     
     def analyze_skill_market_demand(self, skills: List[str]) -> Dict[str, str]:
         """Analyze market demand for skills."""
         # Simplified demand analysis based on categories
-        high_demand = {
-            "cloud", "ai", "ml", "kubernetes", "docker", "react", "python",
-            "typescript", "aws", "data", "devops", "microservices"
-        }
-        
-        medium_demand = {
-            "java", "angular", "vue", "django", "flask", "postgresql",
-            "mongodb", "redis", "jenkins", "git"
-        }
-        
         demand_analysis = {}
         for skill in skills:
             skill_lower = skill.lower()
-            if any(hd in skill_lower for hd in high_demand):
+            if _HIGH_DEMAND_RE.search(skill_lower):
                 demand_analysis[skill] = "High"
-            elif any(md in skill_lower for md in medium_demand):
+            elif _MEDIUM_DEMAND_RE.search(skill_lower):
                 demand_analysis[skill] = "Medium"
             else:
                 demand_analysis[skill] = "Standard"
@@ -1,38 +1,71 @@
 """Application monitoring and metrics."""
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time
 from typing import Dict, Any, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, case, select, true, event
 from app.models.user import User, AnalysisHistory
+from app.services.cache_service import CacheService
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Dashboard aggregates are recomputed at most this often (seconds)
+SYSTEM_METRICS_TTL = 60
+USER_METRICS_TTL = 15
+
+_metrics_cache = CacheService(default_ttl=SYSTEM_METRICS_TTL)
+
+@event.listens_for(AnalysisHistory, "after_insert")
+def _invalidate_analysis_metrics(mapper, connection, target):
+    """Drop cached metrics that a new analysis makes stale."""
+    _metrics_cache.delete("system")
+    _metrics_cache.delete(f"user:{target.user_id}")
+
+@event.listens_for(User, "after_insert")
+def _invalidate_user_metrics(mapper, connection, target):
+    """Drop cached system metrics when a user signs up."""
+    _metrics_cache.delete("system")
+
 class MonitoringService:
     """Service for application monitoring and metrics."""
     
     @staticmethod
     def get_system_metrics(db: Session) -> Dict[str, Any]:
         """Get system-wide metrics."""
+        cached = _metrics_cache.get("system")
+        if cached is not None:
+            return cached
         
-        # User metrics
-        total_users = db.query(User).count()
-        active_users = db.query(User).filter(User.is_active == True).count()
-        new_users_today = db.query(User).filter(
-            func.date(User.created_at) == datetime.now().date()
-        ).count()
+        now = datetime.now()
+        today = now.date()
         
-        # Analysis metrics
-        total_analyses = db.query(AnalysisHistory).count()
-        analyses_today = db.query(AnalysisHistory).filter(
-            func.date(AnalysisHistory.created_at) == datetime.now().date()
-        ).count()
+        # Compare raw timestamps against a range so the created_at indexes apply
+        today_start = datetime.combine(today, time.min)
+        
+        # User and analysis totals in a single round-trip
+        user_stats = select(
+            func.count(User.id).label("users_total"),
+            func.count(case((User.is_active == True, 1))).label("users_active"),
+            func.count(case((User.created_at >= today_start, 1))).label("users_new_today")
+        ).subquery()
+        analysis_stats = select(
+            func.count(AnalysisHistory.id).label("analyses_total"),
+            func.count(case((AnalysisHistory.created_at >= today_start, 1))).label("analyses_today"),
+            func.avg(AnalysisHistory.match_percentage).label("avg_match")
+        ).subquery()
+        totals = db.execute(
+            select(user_stats, analysis_stats).select_from(user_stats.join(analysis_stats, true()))
+        ).one()
         
-        # Average metrics
-        avg_match = db.query(func.avg(AnalysisHistory.match_percentage)).scalar() or 0
+        total_users = totals.users_total
+        active_users = totals.users_active
+        new_users_today = totals.users_new_today
+        total_analyses = totals.analyses_total
+        analyses_today = totals.analyses_today
+        avg_match = totals.avg_match or 0
         
         # Performance metrics
-        thirty_days_ago = datetime.now() - timedelta(days=30)
+        thirty_days_ago = now - timedelta(days=30)
         recent_analyses = db.query(
             func.date(AnalysisHistory.created_at).label("date"),
             func.count(AnalysisHistory.id).label("count")
@@ -42,7 +75,12 @@ class MonitoringService:
             func.date(AnalysisHistory.created_at)
         ).all()
         
-        return {
+        # One entry per calendar day, including days without any analyses
+        counts_by_date = {str(r.date): r.count for r in recent_analyses}
+        first_day = thirty_days_ago.date()
+        days = [str(first_day + timedelta(days=i)) for i in range((today - first_day).days + 1)]
+        
+        metrics = {
             "users": {
                 "total": total_users,
                 "active": active_users,
@@ -55,15 +93,21 @@ class MonitoringService:
             },
             "activity": {
                 "daily_analyses": [
-                    {"date": str(r.date), "count": r.count}
-                    for r in recent_analyses
+                    {"date": day, "count": counts_by_date.get(day, 0)}
+                    for day in days
                 ]
             }
         }
+        _metrics_cache.set("system", metrics)
+        return metrics
     
     @staticmethod
     def get_user_metrics(user_id: int, db: Session) -> Dict[str, Any]:
         """Get metrics for a specific user."""
+        cache_key = f"user:{user_id}"
+        cached = _metrics_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
         # Total analyses
         total = db.query(AnalysisHistory).filter(
@@ -89,14 +133,45 @@ class MonitoringService:
             AnalysisHistory.user_id == user_id
         ).scalar() or 0
         
-        return {
+        metrics = {
             "total_analyses": total,
             "recent_analyses": recent,
             "best_match": round(best, 1),
             "average_match": round(avg, 1)
         }
+        _metrics_cache.set(cache_key, metrics, USER_METRICS_TTL)
+        return metrics
+    
+    @staticmethod
+    def weekly_stats_bulk(user_ids: List[int], db: Session) -> Dict[int, Dict[str, Any]]:
+        """Get weekly summary stats for many users in one grouped query."""
+        seven_days_ago = datetime.now() - timedelta(days=7)
+        rows = db.query(
+            AnalysisHistory.user_id,
+            func.count(AnalysisHistory.id).label("count"),
+            func.avg(AnalysisHistory.match_percentage).label("avg_match"),
+            func.max(AnalysisHistory.match_percentage).label("best_match")
+        ).filter(
+            AnalysisHistory.user_id.in_(user_ids),
+            AnalysisHistory.created_at >= seven_days_ago
+        ).group_by(
+            AnalysisHistory.user_id
+        ).all()
+        
+        # Users without analyses this week still get a summary
+        stats = {
+            user_id: {"analyses_count": 0, "avg_match": 0, "best_match": 0, "skills_improved": 0}
+            for user_id in user_ids
+        }
+        for r in rows:
+            stats[r.user_id].update(
+                analyses_count=r.count,
+                avg_match=round(r.avg_match or 0, 1),
+                best_match=round(r.best_match or 0, 1)
+            )
+        return stats
     
     @staticmethod
     def log_event(event_type: str, data: Dict[str, Any]):
         """Log an application event."""
-        logger.info(f"Event: {event_type} - {data}")
+        logger.info("Event: %s - %s", event_type, data)
@@ -1,216 +1,440 @@
 """NLP service using spaCy for advanced text processing."""
+import asyncio
+import numpy as np
 import spacy
-from typing import List, Dict, Set, Tuple
+from spacy.matcher import PhraseMatcher
+from spacy.tokens import Doc
+from typing import List, Dict, Set, Tuple, Hashable, Any, Iterable, Iterator
+from functools import lru_cache
+import hashlib
+import heapq
+import os
 import re
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Documents per nlp.pipe batch
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+
+# Worker processes for bulk extraction jobs (half the cores by default)
+SPACY_N_PROCESS = int(os.getenv("SPACY_N_PROCESS", str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Skill extraction reads at most MAX_CHARS of a text and feeds it to spaCy in
+# pieces of about SPACY_CHUNK_CHARS: parser cost grows faster than linearly
+# with document length, while regex passes stay cheap on the whole text
+MAX_CHARS = 50_000
+SPACY_CHUNK_CHARS = 4000
+
+# Processed docs and document vectors kept for texts seen again
+# (a resume scored against several jobs)
+DOC_CACHE_SIZE = 256
+VECTOR_CACHE_SIZE = 4096
+
+# Multi-word technical terms, matched in one scan as a single alternation
+_MULTI_WORD_PATTERNS = [
+    r'machine\s+learning',
+    r'deep\s+learning',
+    r'computer\s+vision',
+    r'natural\s+language\s+processing',
+    r'version\s+control',
+    r'full[\s\-]?stack',
+    r'front[\s\-]?end',
+    r'back[\s\-]?end',
+    r'dev[\s\-]?ops',
+    r'data\s+science',
+    r'data\s+analysis',
+    r'data\s+engineering',
+    r'cloud\s+computing',
+    r'web\s+development',
+    r'mobile\s+development',
+    r'cross[\s\-]platform',
+    r'real[\s\-]time',
+    r'open[\s\-]source',
+    r'load\s+balancing',
+    r'message\s+queue',
+    r'event[\s\-]driven',
+    r'test[\s\-]driven',
+    r'object[\s\-]oriented',
+    r'functional\s+programming',
+    r'reactive\s+programming',
+    r'distributed\s+systems',
+    r'high\s+availability',
+    r'fault\s+tolerance',
+    r'elastic\s+search',
+    r'big\s+data',
+    r'business\s+intelligence',
+    r'continuous\s+integration',
+    r'continuous\s+deployment',
+]
+
+_MULTI_WORD_RE = re.compile("|".join(_MULTI_WORD_PATTERNS))
+
+# Phrases like "experience with X"; each alternative captures one term
+_EXPERIENCE_PATTERNS = [
+    r'experience\s+(?:with|in)\s+([a-zA-Z][\w\.\#\+\-]*)',
+    r'knowledge\s+of\s+([a-zA-Z][\w\.\#\+\-]*)',
+    r'proficient\s+in\s+([a-zA-Z][\w\.\#\+\-]*)',
+    r'familiar\s+with\s+([a-zA-Z][\w\.\#\+\-]*)',
+    r'worked\s+with\s+([a-zA-Z][\w\.\#\+\-]*)',
+    r'using\s+([a-zA-Z][\w\.\#\+\-]*)',
+]
+
+_EXPERIENCE_RE = re.compile("|".join(_EXPERIENCE_PATTERNS))
+
+# "Skills: Python, Java, etc." is kept separate since it spans to the next period
+_SKILLS_LIST_RE = re.compile(r'skills?:\s*([^\.]+)')
+
+# Years of experience, then seniority keywords when no years are given
+_YEAR_RE = re.compile(r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s+)?(?:experience)?')
+_SENIOR_RE = re.compile(r'\b(senior|sr\.?|lead|principal|staff|architect)\b')
+_MID_RE = re.compile(r'\b(mid[\s\-]?level|intermediate|experienced)\b')
+_JUNIOR_RE = re.compile(r'\b(junior|jr\.?|entry[\s\-]?level|beginner|intern)\b')
+
+# Entity types whose text may be a technology name
+TECH_ENTITY_LABELS = ("ORG", "PRODUCT", "WORK_OF_ART")
+
+_CONNECTOR_RE = re.compile(r'\b(and|or)\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_SKILL_CHARS_RE = re.compile(r'[^\w\-\.\#\+]')
+
+# Common words to exclude (not skills)
+STOP_WORDS = frozenset({
+    'experience', 'experienced', 'work', 'working', 'worked', 'develop', 'developed',
+    'developing', 'build', 'built', 'building', 'create', 'created', 'creating',
+    'year', 'years', 'month', 'months', 'day', 'days', 'responsible', 'responsibility',
+    'responsibilities', 'required', 'requirement', 'requirements', 'skill', 'skills',
+    'team', 'teams', 'project', 'projects', 'company', 'companies', 'client', 'clients',
+    'application', 'applications', 'system', 'systems', 'software', 'development',
+    'looking', 'seeking', 'need', 'needs', 'must', 'have', 'should', 'would', 'could',
+    'will', 'can', 'using', 'used', 'use', 'including', 'include', 'includes',
+    'knowledge', 'understanding', 'familiar', 'familiarity', 'proficient', 'proficiency',
+    'strong', 'good', 'excellent', 'expert', 'expertise', 'advanced', 'basic',
+    'minimum', 'maximum', 'least', 'most', 'more', 'less', 'better', 'best',
+    'new', 'existing', 'current', 'previous', 'present', 'past', 'future',
+    'first', 'second', 'third', 'last', 'next', 'other', 'another', 'each',
+    'all', 'some', 'any', 'many', 'few', 'several', 'various', 'multiple',
+    'single', 'double', 'triple', 'high', 'low', 'medium', 'large', 'small',
+    'big', 'little', 'long', 'short', 'wide', 'narrow', 'deep', 'shallow',
+    'etc', 'e.g', 'i.e', 'ex', 'example', 'examples', 'such', 'like',
+    'bachelors', 'masters', 'degree', 'certification', 'certified', 'certificate',
+    'university', 'college', 'school', 'education', 'graduate', 'undergraduate',
+    'senior', 'junior', 'lead', 'principal', 'staff', 'engineer', 'developer',
+    'manager', 'director', 'architect', 'analyst', 'consultant', 'specialist',
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'shall', 'may', 'might', 'must', 'can', 'could', 'would', 'should'
+})
+
+# Known technology skills (comprehensive list)
+KNOWN_SKILLS = frozenset({
+    # Programming Languages
+    'python', 'javascript', 'typescript', 'java', 'c++', 'c#', 'ruby', 'go', 'golang',
+    'rust', 'swift', 'kotlin', 'scala', 'php', 'perl', 'r', 'matlab', 'julia',
+    'objective-c', 'dart', 'lua', 'haskell', 'clojure', 'elixir', 'erlang', 'f#',
+    
+    # Frontend
+    'react', 'react.js', 'reactjs', 'angular', 'angularjs', 'vue', 'vue.js', 'vuejs',
+    'svelte', 'next.js', 'nextjs', 'nuxt.js', 'nuxtjs', 'gatsby', 'ember', 'backbone',
+    'html', 'html5', 'css', 'css3', 'sass', 'scss', 'less', 'stylus',
+    'tailwind', 'tailwindcss', 'bootstrap', 'material-ui', 'mui', 'antd', 'chakra-ui',
+    'styled-components', 'emotion', 'jquery', 'webpack', 'vite', 'parcel', 'rollup',
+    'babel', 'redux', 'mobx', 'zustand', 'recoil', 'jest', 'cypress', 'playwright',
+    
+    # Backend
+    'node.js', 'nodejs', 'node', 'express', 'express.js', 'fastapi', 'django', 'flask',
+    'spring', 'spring-boot', 'springboot', 'rails', 'ruby-on-rails', 'laravel',
+    'asp.net', '.net', 'dotnet', 'gin', 'echo', 'fiber', 'koa', 'nestjs', 'nest.js',
+    'fastify', 'hapi', 'strapi', 'graphql', 'rest', 'restful', 'soap', 'grpc',
+    'microservices', 'serverless', 'lambda', 'api', 'oauth', 'jwt', 'websocket',
+    
+    # Databases
+    'sql', 'nosql', 'postgresql', 'postgres', 'mysql', 'mariadb', 'mongodb', 'redis',
+    'elasticsearch', 'elastic', 'cassandra', 'dynamodb', 'sqlite', 'oracle',
+    'sqlserver', 'sql-server', 'mssql', 'neo4j', 'couchdb', 'firebase', 'firestore',
+    'supabase', 'prisma', 'sequelize', 'typeorm', 'mongoose', 'knex', 'drizzle',
+    
+    # Cloud & DevOps
+    'aws', 'amazon-web-services', 'azure', 'gcp', 'google-cloud', 'google-cloud-platform',
+    'docker', 'kubernetes', 'k8s', 'jenkins', 'gitlab', 'github', 'git', 'bitbucket',
+    'terraform', 'ansible', 'puppet', 'chef', 'helm', 'istio', 'consul', 'vault',
+    'ci/cd', 'cicd', 'travis', 'circleci', 'github-actions', 'gitlab-ci', 'argocd',
+    'prometheus', 'grafana', 'datadog', 'newrelic', 'elk', 'kibana', 'logstash',
+    'nginx', 'apache', 'caddy', 'haproxy', 'cloudflare', 'cdn', 'load-balancing',
+    'linux', 'ubuntu', 'centos', 'rhel', 'debian', 'bash', 'shell', 'powershell',
+    
+    # Data & AI/ML
+    'machine-learning', 'ml', 'deep-learning', 'dl', 'artificial-intelligence', 'ai',
+    'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'sklearn', 'pandas', 'numpy',
+    'matplotlib', 'seaborn', 'plotly', 'jupyter', 'notebook', 'colab', 'nltk',
+    'spacy', 'opencv', 'computer-vision', 'nlp', 'natural-language-processing',
+    'bert', 'gpt', 'transformer', 'lstm', 'cnn', 'rnn', 'gan', 'reinforcement-learning',
+    'hadoop', 'spark', 'pyspark', 'hive', 'presto', 'flink', 'kafka', 'airflow',
+    'tableau', 'power-bi', 'powerbi', 'looker', 'metabase', 'superset', 'dbt',
+    
+    # Mobile
+    'ios', 'android', 'react-native', 'flutter', 'xamarin', 'ionic', 'cordova',
+    'swift-ui', 'swiftui', 'jetpack-compose', 'expo', 'capacitor',
+    
+    # Testing
+    'unit-testing', 'integration-testing', 'e2e-testing', 'tdd', 'bdd', 'pytest',
+    'unittest', 'mocha', 'chai', 'jasmine', 'karma', 'selenium', 'puppeteer',
+    'postman', 'insomnia', 'jmeter', 'locust', 'vitest',
+    
+    # Other Tools & Concepts
+    'agile', 'scrum', 'kanban', 'jira', 'confluence', 'slack', 'trello', 'asana',
+    'figma', 'sketch', 'adobe-xd', 'photoshop', 'illustrator', 'ui/ux', 'ux/ui',
+    'vscode', 'vs-code', 'intellij', 'eclipse', 'vim', 'emacs', 'sublime',
+    'blockchain', 'web3', 'ethereum', 'solidity', 'smart-contracts', 'nft', 'defi',
+    'ar', 'vr', 'unity', 'unreal-engine', 'three.js', 'threejs', 'webgl', 'canvas'
+})
+
+# Known skills followed by a version number ("python 3.11", "html5"). Only
+# plain-word skill names, as the old per-word scan needed; membership is
+# checked by the regex itself instead of per match
+_VERSIONED_SKILL_RE = re.compile(
+    r'\b(' + '|'.join(sorted((skill for skill in KNOWN_SKILLS if re.fullmatch(r'[a-z]\w*', skill)), key=len, reverse=True))
+    + r')\s*(?:v?[\d\.]+)\b'
+)
+
+# Known skills as one alternation, longest first so "node.js" wins over "node".
+# Catches skills inside tokens spaCy keeps whole, e.g. "node.js/express.js"
+_KNOWN_SKILL_RE = re.compile(
+    r'\b(?:' + '|'.join(re.escape(skill) for skill in sorted(KNOWN_SKILLS, key=len, reverse=True)) + r')\b'
+)
+
+def _chunk_text(text: str, size: int) -> List[str]:
+    """Split text into pieces of at most ``size`` chars, at line or word breaks."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + size
+        if end < len(text):
+            # Prefer a line break, then a space, so no token is cut in half
+            cut = text.rfind("\n", start, end)
+            if cut <= start:
+                cut = text.rfind(" ", start, end)
+            if cut > start:
+                end = cut
+        chunks.append(text[start:end])
+        start = end
+    return chunks or [""]
+
+def _text_key(text: str) -> bytes:
+    """Compact cache key for a text."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+class _LRUCache:
+    """Small thread-safe LRU mapping."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_many(self, keys: List[Hashable]) -> List[Any]:
+        """Look up keys, returning None for misses."""
+        with self._lock:
+            values = [self._data.get(key) for key in keys]
+            for key, value in zip(keys, values):
+                if value is not None:
+                    self._data.move_to_end(key)
+        return values
+    
+    def put_many(self, items: List[Tuple[Hashable, Any]]) -> None:
+        """Store values, evicting the least recently used beyond maxsize."""
+        with self._lock:
+            for key, value in items:
+                self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
 class NLPService:
     """Advanced NLP processing using spaCy."""
     
     def __init__(self):
         """Initialize spaCy model."""
+        # Lemmas are never read, so skip the lemmatizer entirely
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load("en_core_web_sm", disable=["lemmatizer"])
         except OSError:
             logger.error("spaCy model not found. Installing...")
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
-        
-        # Common words to exclude (not skills)
-        self.stop_words = {
-            'experience', 'experienced', 'work', 'working', 'worked', 'develop', 'developed',
-            'developing', 'build', 'built', 'building', 'create', 'created', 'creating',
-            'year', 'years', 'month', 'months', 'day', 'days', 'responsible', 'responsibility',
-            'responsibilities', 'required', 'requirement', 'requirements', 'skill', 'skills',
-            'team', 'teams', 'project', 'projects', 'company', 'companies', 'client', 'clients',
-            'application', 'applications', 'system', 'systems', 'software', 'development',
-            'looking', 'seeking', 'need', 'needs', 'must', 'have', 'should', 'would', 'could',
-            'will', 'can', 'using', 'used', 'use', 'including', 'include', 'includes',
-            'knowledge', 'understanding', 'familiar', 'familiarity', 'proficient', 'proficiency',
-            'strong', 'good', 'excellent', 'expert', 'expertise', 'advanced', 'basic',
-            'minimum', 'maximum', 'least', 'most', 'more', 'less', 'better', 'best',
-            'new', 'existing', 'current', 'previous', 'present', 'past', 'future',
-            'first', 'second', 'third', 'last', 'next', 'other', 'another', 'each',
-            'all', 'some', 'any', 'many', 'few', 'several', 'various', 'multiple',
-            'single', 'double', 'triple', 'high', 'low', 'medium', 'large', 'small',
-            'big', 'little', 'long', 'short', 'wide', 'narrow', 'deep', 'shallow',
-            'etc', 'e.g', 'i.e', 'ex', 'example', 'examples', 'such', 'like',
-            'bachelors', 'masters', 'degree', 'certification', 'certified', 'certificate',
-            'university', 'college', 'school', 'education', 'graduate', 'undergraduate',
-            'senior', 'junior', 'lead', 'principal', 'staff', 'engineer', 'developer',
-            'manager', 'director', 'architect', 'analyst', 'consultant', 'specialist',
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'be',
-            'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-            'shall', 'may', 'might', 'must', 'can', 'could', 'would', 'should'
-        }
+            self.nlp = spacy.load("en_core_web_sm", disable=["lemmatizer"])
         
-        # Known technology skills (comprehensive list)
-        self.known_skills = {
-            # Programming Languages
-            'python', 'javascript', 'typescript', 'java', 'c++', 'c#', 'ruby', 'go', 'golang',
-            'rust', 'swift', 'kotlin', 'scala', 'php', 'perl', 'r', 'matlab', 'julia',
-            'objective-c', 'dart', 'lua', 'haskell', 'clojure', 'elixir', 'erlang', 'f#',
-            
-            # Frontend
-            'react', 'react.js', 'reactjs', 'angular', 'angularjs', 'vue', 'vue.js', 'vuejs',
-            'svelte', 'next.js', 'nextjs', 'nuxt.js', 'nuxtjs', 'gatsby', 'ember', 'backbone',
-            'html', 'html5', 'css', 'css3', 'sass', 'scss', 'less', 'stylus',
-            'tailwind', 'tailwindcss', 'bootstrap', 'material-ui', 'mui', 'antd', 'chakra-ui',
-            'styled-components', 'emotion', 'jquery', 'webpack', 'vite', 'parcel', 'rollup',
-            'babel', 'redux', 'mobx', 'zustand', 'recoil', 'jest', 'cypress', 'playwright',
-            
-            # Backend
-            'node.js', 'nodejs', 'node', 'express', 'express.js', 'fastapi', 'django', 'flask',
-            'spring', 'spring-boot', 'springboot', 'rails', 'ruby-on-rails', 'laravel',
-            'asp.net', '.net', 'dotnet', 'gin', 'echo', 'fiber', 'koa', 'nestjs', 'nest.js',
-            'fastify', 'hapi', 'strapi', 'graphql', 'rest', 'restful', 'soap', 'grpc',
-            'microservices', 'serverless', 'lambda', 'api', 'oauth', 'jwt', 'websocket',
-            
-            # Databases
-            'sql', 'nosql', 'postgresql', 'postgres', 'mysql', 'mariadb', 'mongodb', 'redis',
-            'elasticsearch', 'elastic', 'cassandra', 'dynamodb', 'sqlite', 'oracle',
-            'sqlserver', 'sql-server', 'mssql', 'neo4j', 'couchdb', 'firebase', 'firestore',
-            'supabase', 'prisma', 'sequelize', 'typeorm', 'mongoose', 'knex', 'drizzle',
-            
-            # Cloud & DevOps
-            'aws', 'amazon-web-services', 'azure', 'gcp', 'google-cloud', 'google-cloud-platform',
-            'docker', 'kubernetes', 'k8s', 'jenkins', 'gitlab', 'github', 'git', 'bitbucket',
-            'terraform', 'ansible', 'puppet', 'chef', 'helm', 'istio', 'consul', 'vault',
-            'ci/cd', 'cicd', 'travis', 'circleci', 'github-actions', 'gitlab-ci', 'argocd',
-            'prometheus', 'grafana', 'datadog', 'newrelic', 'elk', 'kibana', 'logstash',
-            'nginx', 'apache', 'caddy', 'haproxy', 'cloudflare', 'cdn', 'load-balancing',
-            'linux', 'ubuntu', 'centos', 'rhel', 'debian', 'bash', 'shell', 'powershell',
-            
-            # Data & AI/ML
-            'machine-learning', 'ml', 'deep-learning', 'dl', 'artificial-intelligence', 'ai',
-            'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'sklearn', 'pandas', 'numpy',
-            'matplotlib', 'seaborn', 'plotly', 'jupyter', 'notebook', 'colab', 'nltk',
-            'spacy', 'opencv', 'computer-vision', 'nlp', 'natural-language-processing',
-            'bert', 'gpt', 'transformer', 'lstm', 'cnn', 'rnn', 'gan', 'reinforcement-learning',
-            'hadoop', 'spark', 'pyspark', 'hive', 'presto', 'flink', 'kafka', 'airflow',
-            'tableau', 'power-bi', 'powerbi', 'looker', 'metabase', 'superset', 'dbt',
-            
-            # Mobile
-            'ios', 'android', 'react-native', 'flutter', 'xamarin', 'ionic', 'cordova',
-            'swift-ui', 'swiftui', 'jetpack-compose', 'expo', 'capacitor',
-            
-            # Testing
-            'unit-testing', 'integration-testing', 'e2e-testing', 'tdd', 'bdd', 'pytest',
-            'unittest', 'mocha', 'chai', 'jasmine', 'karma', 'selenium', 'puppeteer',
-            'postman', 'insomnia', 'jmeter', 'locust', 'vitest',
-            
-            # Other Tools & Concepts
-            'agile', 'scrum', 'kanban', 'jira', 'confluence', 'slack', 'trello', 'asana',
-            'figma', 'sketch', 'adobe-xd', 'photoshop', 'illustrator', 'ui/ux', 'ux/ui',
-            'vscode', 'vs-code', 'intellij', 'eclipse', 'vim', 'emacs', 'sublime',
-            'blockchain', 'web3', 'ethereum', 'solidity', 'smart-contracts', 'nft', 'defi',
-            'ar', 'vr', 'unity', 'unreal-engine', 'three.js', 'threejs', 'webgl', 'canvas'
-        }
+        # Components each call site actually reads from the doc. NER keeps the
+        # parser because entities may not cross the sentence boundaries it sets.
+        self._skill_disable = self._pipes_to_disable(["parser", "ner"])
+        self._entity_disable = self._pipes_to_disable(["parser", "ner"])
+        self._phrase_disable = self._pipes_to_disable(["tagger", "attribute_ruler", "parser"])
+        self._similarity_disable = self._pipes_to_disable(["tok2vec"])
+        
+        self._doc_cache = _LRUCache(DOC_CACHE_SIZE)
+        self._vector_cache = _LRUCache(VECTOR_CACHE_SIZE)
+        
+        self.stop_words = STOP_WORDS
+        self.known_skills = KNOWN_SKILLS
+        self.skill_matcher = self._build_skill_matcher()
+        self._skill_bases = self._skill_variant_bases()
+        
+        # Entity label ids that may name a technology, compared as ints per entity
+        self._tech_entity_labels = frozenset(
+            self.nlp.vocab.strings.add(label) for label in TECH_ENTITY_LABELS
+        )
+    
+    def _build_skill_matcher(self) -> PhraseMatcher:
+        """Build a case-insensitive matcher with one match key per known skill."""
+        skills = sorted(self.known_skills)
+        skill_docs = dict(zip(skills, self.nlp.tokenizer.pipe(skills)))
+        
+        # "react.js" should also count as "react", as a word-boundary search would
+        patterns = {skill: [doc] for skill, doc in skill_docs.items()}
+        for skill, doc in skill_docs.items():
+            for dot in (i for i, char in enumerate(skill) if char == "."):
+                if skill[:dot] in patterns:
+                    patterns[skill[:dot]].append(doc)
+        
+        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        for skill, docs in patterns.items():
+            matcher.add(skill, docs)
+        return matcher
+    
+    def _skill_variant_bases(self) -> Dict[str, str]:
+        """Map dotted skill variants ("react.js") to their shortest known base ("react")."""
+        bases = {}
+        for skill in self.known_skills:
+            for dot in (i for i, char in enumerate(skill) if char == "."):
+                if skill[:dot] in self.known_skills:
+                    bases[skill] = skill[:dot]
+                    break
+        return bases
+    
+    def _pipes_to_disable(self, needed: List[str]) -> List[str]:
+        """Pipeline components that can be skipped when only ``needed`` are read."""
+        needed = set(needed)
+        # Components sharing the tok2vec layer need it to run first
+        if "tok2vec" in self.nlp.pipe_names:
+            if needed & set(self.nlp.get_pipe("tok2vec").listening_components):
+                needed.add("tok2vec")
+        return [name for name in self.nlp.pipe_names if name not in needed]
+    
+    def _pipe(self, texts: List[str], disable: List[str]) -> List[Doc]:
+        """Run texts through the spaCy pipeline in batches, reusing cached docs.
+        
+        Docs are cached per text hash and set of disabled components, so a
+        text is only processed again when a caller needs other annotations.
+        """
+        keys = [(tuple(disable), _text_key(text)) for text in texts]
+        docs = self._doc_cache.get_many(keys)
+        
+        missing = [i for i, doc in enumerate(docs) if doc is None]
+        if missing:
+            processed = self.nlp.pipe(
+                (texts[i] for i in missing), batch_size=SPACY_BATCH_SIZE, disable=disable
+            )
+            for i, doc in zip(missing, processed):
+                docs[i] = doc
+            self._doc_cache.put_many([(keys[i], docs[i]) for i in missing])
+        
+        return docs
     
     def extract_skills_advanced(self, text: str) -> Set[str]:
         """Extract skills using advanced NLP techniques with better filtering."""
+        return self.extract_skills_batch([text])[0]
+    
+    def extract_skills_batch(self, texts: List[str]) -> List[Set[str]]:
+        """Extract skills from many texts with one pipeline pass."""
+        texts = [text[:MAX_CHARS] for text in texts]
+        chunked = [_chunk_text(text, SPACY_CHUNK_CHARS) for text in texts]
+        docs = iter(self._pipe([chunk for chunks in chunked for chunk in chunks], self._skill_disable))
+        return [
+            self._extract_skills(text, [next(docs) for _ in chunks])
+            for text, chunks in zip(texts, chunked)
+        ]
+    
+    def extract_skills_bulk(self, texts: Iterable[str], n_process: int = SPACY_N_PROCESS) -> Iterator[Set[str]]:
+        """Extract skills from a large stream of texts, spreading spaCy over processes.
+        
+        Meant for offline jobs such as re-ranking many resumes: results are
+        yielded in input order and docs bypass the doc cache. Per-request
+        code should keep using extract_skills_advanced/extract_skills_batch.
+        """
+        truncated = []
+        
+        def chunks():
+            for index, text in enumerate(texts):
+                text = text[:MAX_CHARS]
+                truncated.append(text)
+                for chunk in _chunk_text(text, SPACY_CHUNK_CHARS):
+                    yield chunk, index
+        
+        processed = self.nlp.pipe(
+            chunks(), as_tuples=True, batch_size=SPACY_BATCH_SIZE,
+            disable=self._skill_disable, n_process=n_process
+        )
+        
+        # Every text has at least one chunk and chunks of one text arrive
+        # consecutively, so group them back by index as they stream in
+        current, docs = 0, []
+        for doc, index in processed:
+            if index != current:
+                yield self._extract_skills(truncated[current], docs)
+                truncated[current] = None
+                current, docs = index, []
+            docs.append(doc)
+        if truncated:
+            yield self._extract_skills(truncated[current], docs)
+    
+    def _extract_skills(self, text: str, docs: List[Doc]) -> Set[str]:
+        """Extract skills from a text and the processed docs of its chunks."""
         text_lower = text.lower()
         skills = set()
         
-        # Method 1: Direct matching with known skills
-        for skill in self.known_skills:
-            # Check for word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                skills.add(skill)
+        # Method 1: Direct matching with known skills in a single pass over the tokens
+        strings = self.nlp.vocab.strings
+        for doc in docs:
+            for match_id, _, _ in self.skill_matcher(doc):
+                skills.add(strings[match_id])
+        skills.update(match.group() for match in _KNOWN_SKILL_RE.finditer(text_lower))
         
         # Method 2: Extract multi-word technical terms
-        multi_word_patterns = [
-            r'machine\s+learning',
-            r'deep\s+learning',
-            r'computer\s+vision',
-            r'natural\s+language\s+processing',
-            r'version\s+control',
-            r'full[\s\-]?stack',
-            r'front[\s\-]?end',
-            r'back[\s\-]?end',
-            r'dev[\s\-]?ops',
-            r'data\s+science',
-            r'data\s+analysis',
-            r'data\s+engineering',
-            r'cloud\s+computing',
-            r'web\s+development',
-            r'mobile\s+development',
-            r'cross[\s\-]platform',
-            r'real[\s\-]time',
-            r'open[\s\-]source',
-            r'load\s+balancing',
-            r'message\s+queue',
-            r'event[\s\-]driven',
-            r'test[\s\-]driven',
-            r'object[\s\-]oriented',
-            r'functional\s+programming',
-            r'reactive\s+programming',
-            r'distributed\s+systems',
-            r'high\s+availability',
-            r'fault\s+tolerance',
-            r'elastic\s+search',
-            r'big\s+data',
-            r'business\s+intelligence',
-            r'continuous\s+integration',
-            r'continuous\s+deployment',
-        ]
-        
-        for pattern in multi_word_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                skill_text = match.group().replace(' ', '-')
-                skills.add(skill_text)
+        for match in _MULTI_WORD_RE.finditer(text_lower):
+            skill_text = match.group().replace(' ', '-')
+            skills.add(skill_text)
         
         # Method 3: Extract technology names with version numbers
-        version_pattern = r'\b([a-zA-Z]+[\w]*)\s*(?:v?[\d\.]+)\b'
-        matches = re.finditer(version_pattern, text_lower)
-        for match in matches:
-            potential_skill = match.group(1).lower()
-            if potential_skill in self.known_skills:
-                skills.add(potential_skill)
+        skills.update(match.group(1) for match in _VERSIONED_SKILL_RE.finditer(text_lower))
         
         # Method 4: Extract from common phrases like "experience with X"
-        experience_patterns = [
-            r'experience\s+(?:with|in)\s+([a-zA-Z][\w\.\#\+\-]*)',
-            r'knowledge\s+of\s+([a-zA-Z][\w\.\#\+\-]*)',
-            r'proficient\s+in\s+([a-zA-Z][\w\.\#\+\-]*)',
-            r'familiar\s+with\s+([a-zA-Z][\w\.\#\+\-]*)',
-            r'worked\s+with\s+([a-zA-Z][\w\.\#\+\-]*)',
-            r'using\s+([a-zA-Z][\w\.\#\+\-]*)',
-            r'skills?:\s*([^\.]+)',  # Skills: Python, Java, etc.
-        ]
-        
-        for pattern in experience_patterns:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                potential_skills = match.group(1).split(',')
-                for ps in potential_skills:
-                    ps_clean = ps.strip().lower()
-                    # Remove "and", "or" connectors
-                    ps_clean = re.sub(r'\b(and|or)\b', '', ps_clean).strip()
-                    if ps_clean in self.known_skills:
-                        skills.add(ps_clean)
+        candidates = [match.group(match.lastindex) for match in _EXPERIENCE_RE.finditer(text_lower)]
+        candidates.extend(match.group(1) for match in _SKILLS_LIST_RE.finditer(text_lower))
+        for candidate in candidates:
+            potential_skills = candidate.split(',')
+            for ps in potential_skills:
+                ps_clean = ps.strip()
+                # Remove "and", "or" connectors
+                ps_clean = _CONNECTOR_RE.sub('', ps_clean).strip()
+                if ps_clean in self.known_skills:
+                    skills.add(ps_clean)
         
         # Method 5: Use spaCy NER for proper nouns that might be technologies
-        doc = self.nlp(text)
-        for ent in doc.ents:
-            if ent.label_ in ["ORG", "PRODUCT", "WORK_OF_ART"]:
-                ent_lower = ent.text.lower()
-                if ent_lower in self.known_skills:
-                    skills.add(ent_lower)
+        for doc in docs:
+            for ent in doc.ents:
+                if ent.label in self._tech_entity_labels:
+                    ent_lower = ent.text.lower()
+                    if ent_lower in self.known_skills:
+                        skills.add(ent_lower)
         
         # Clean up skills - remove any that are too short or in stop words
         cleaned_skills = set()
         for skill in skills:
             # Remove extra spaces and clean up
-            skill = re.sub(r'\s+', '-', skill.strip())
-            skill = re.sub(r'[^\w\-\.\#\+]', '', skill)
+            skill = _WHITESPACE_RE.sub('-', skill.strip())
+            skill = _NON_SKILL_CHARS_RE.sub('', skill)
             
             # Filter out bad skills
             if (len(skill) > 1 and 
@@ -223,23 +447,75 @@ class NLPService:
     
     def calculate_semantic_similarity(self, text1: str, text2: str) -> float:
         """Calculate semantic similarity between two texts."""
-        doc1 = self.nlp(text1[:1000])  # Limit text length for performance
-        doc2 = self.nlp(text2[:1000])
+        text1, text2 = text1[:1000], text2[:1000]  # Limit text length for performance
+        (vec1, norm1), (vec2, norm2) = self._vectors([text1, text2])
         
-        if doc1.vector_norm and doc2.vector_norm:
-            return doc1.similarity(doc2)
-        return 0.0
+        if not (norm1 and norm2):
+            return 0.0
+        if text1 == text2:
+            return 1.0
+        return float(np.dot(vec1, vec2) / (norm1 * norm2))
+    
+    def batch_similarity(self, text: str, others: List[str]) -> np.ndarray:
+        """Similarity of one text against many others as a single matrix-vector product."""
+        if not others:
+            return np.zeros(0, dtype=np.float32)
+        
+        text = text[:1000]
+        others = [other[:1000] for other in others]
+        vectors = self._vectors([text] + others)
+        
+        vec, norm = vectors[0]
+        similarities = np.zeros(len(others), dtype=np.float32)
+        # Empty or out-of-vocabulary texts have no vector and stay at 0.0
+        rows = [i for i, (_, other_norm) in enumerate(vectors[1:]) if other_norm]
+        if not (norm and rows):
+            return similarities
+        
+        matrix = np.vstack([vectors[i + 1][0] for i in rows])
+        norms = np.array([vectors[i + 1][1] for i in rows], dtype=matrix.dtype)
+        similarities[rows] = (matrix @ vec) / (norms * norm)
+        
+        # Keep parity with calculate_semantic_similarity for identical texts
+        for i in rows:
+            if others[i] == text:
+                similarities[i] = 1.0
+        return similarities
+    
+    def _vectors(self, texts: List[str]) -> List[Tuple[np.ndarray, float]]:
+        """Document vectors and their norms, cached by text hash.
+        
+        Each distinct uncached text is processed once; texts are fed to
+        ``nlp.pipe`` sorted by length so each batch holds similarly sized
+        documents.
+        """
+        keys = [_text_key(text) for text in texts]
+        vectors = self._vector_cache.get_many(keys)
+        
+        missing = {}
+        for key, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing[key] = text
+        
+        if missing:
+            pending = sorted(missing.items(), key=lambda item: len(item[1]))
+            docs = self.nlp.pipe(
+                (text for _, text in pending), batch_size=SPACY_BATCH_SIZE, disable=self._similarity_disable
+            )
+            computed = {key: (doc.vector, float(doc.vector_norm)) for (key, _), doc in zip(pending, docs)}
+            self._vector_cache.put_many(list(computed.items()))
+            vectors = [vector if vector is not None else computed[key] for key, vector in zip(keys, vectors)]
+        
+        return vectors
     
     def extract_experience_level(self, text: str) -> str:
         """Extract experience level from text."""
         text_lower = text.lower()
         
-        # Look for year patterns
-        year_pattern = r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s+)?(?:experience)?'
-        matches = re.findall(year_pattern, text_lower)
+        # Look for year patterns, streaming matches rather than collecting them
+        years = max((int(match.group(1)) for match in _YEAR_RE.finditer(text_lower)), default=None)
         
-        if matches:
-            years = max(int(m) for m in matches if m.isdigit())
+        if years is not None:
             if years >= 10:
                 return "Senior/Lead"
             elif years >= 5:
@@ -252,41 +528,49 @@ class NLPService:
                 return "Entry-level"
         
         # Check for level indicators
-        if re.search(r'\b(senior|sr\.?|lead|principal|staff|architect)\b', text_lower):
+        if _SENIOR_RE.search(text_lower):
             return "Senior"
-        elif re.search(r'\b(mid[\s\-]?level|intermediate|experienced)\b', text_lower):
+        elif _MID_RE.search(text_lower):
             return "Mid-level"
-        elif re.search(r'\b(junior|jr\.?|entry[\s\-]?level|beginner|intern)\b', text_lower):
+        elif _JUNIOR_RE.search(text_lower):
             return "Junior"
         
         return "Not specified"
     
     def extract_key_phrases(self, text: str, top_n: int = 10) -> List[Tuple[str, float]]:
         """Extract key phrases using TF-IDF-like scoring."""
-        doc = self.nlp(text[:1000])  # Limit for performance
-        
-        phrases = []
-        for chunk in doc.noun_chunks:
-            chunk_text = chunk.text.lower().strip()
-            if (len(chunk_text) > 2 and 
-                chunk_text not in self.stop_words and
-                not any(word in chunk_text for word in ['experience', 'year', 'position'])):
-                phrases.append(chunk_text)
-        
-        # Count and score
-        phrase_freq = Counter(phrases)
-        scored_phrases = []
-        for phrase, freq in phrase_freq.items():
-            # Prefer longer, more specific phrases
-            score = freq * (1 + len(phrase.split()) * 0.2)
-            scored_phrases.append((phrase, score))
-        
-        scored_phrases.sort(key=lambda x: x[1], reverse=True)
-        return scored_phrases[:top_n]
+        return self.extract_key_phrases_batch([text], top_n)[0]
+    
+    def extract_key_phrases_batch(self, texts: List[str], top_n: int = 10) -> List[List[Tuple[str, float]]]:
+        """Extract key phrases from many texts with one pipeline pass."""
+        docs = self._pipe([text[:1000] for text in texts], self._phrase_disable)  # Limit for performance
+        return [self._key_phrases_from_doc(doc, top_n) for doc in docs]
+    
+    def _key_phrases_from_doc(self, doc: Doc, top_n: int) -> List[Tuple[str, float]]:
+        """Score the noun chunks of a processed doc."""
+        phrases = (chunk.text.lower().strip() for chunk in doc.noun_chunks)
+        phrase_freq = Counter(
+            phrase for phrase in phrases
+            if (len(phrase) > 2 and 
+                phrase not in self.stop_words and
+                not any(word in phrase for word in ['experience', 'year', 'position']))
+        )
+        
+        # Prefer longer, more specific phrases; only the top_n need ordering
+        scored_phrases = ((phrase, freq * (1 + len(phrase.split()) * 0.2)) for phrase, freq in phrase_freq.items())
+        return heapq.nlargest(top_n, scored_phrases, key=lambda x: x[1])
     
     def extract_entities(self, text: str) -> Dict[str, List[str]]:
         """Extract named entities from text."""
-        doc = self.nlp(text[:1000])
+        return self.extract_entities_batch([text])[0]
+    
+    def extract_entities_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """Extract named entities from many texts with one pipeline pass."""
+        docs = self._pipe([text[:1000] for text in texts], self._entity_disable)
+        return [self._entities_from_doc(doc) for doc in docs]
+    
+    def _entities_from_doc(self, doc: Doc) -> Dict[str, List[str]]:
+        """Group the named entities of a processed doc."""
         entities = {
             "organizations": [],
             "locations": [],
@@ -299,4 +583,40 @@ class NLPService:
             elif ent.label_ in ["GPE", "LOC"]:
                 entities["locations"].append(ent.text)
         
+        # Technologies come from the known-skill matcher rather than NER labels,
+        # with dotted variants reported under their base skill
+        strings = self.nlp.vocab.strings
+        for match_id, _, _ in self.skill_matcher(doc):
+            skill = strings[match_id]
+            skill = self._skill_bases.get(skill, skill)
+            if skill not in entities["technologies"]:
+                entities["technologies"].append(skill)
+        
         return entities
+    
+    # Async variants run the CPU-bound work in a worker thread so async
+    # handlers don't block the event loop while spaCy processes a text
+    async def a_extract_skills_advanced(self, text: str) -> Set[str]:
+        """Async variant of extract_skills_advanced."""
+        return await asyncio.to_thread(self.extract_skills_advanced, text)
+    
+    async def a_extract_skills_batch(self, texts: List[str]) -> List[Set[str]]:
+        """Async variant of extract_skills_batch."""
+        return await asyncio.to_thread(self.extract_skills_batch, texts)
+    
+    async def a_calculate_semantic_similarity(self, text1: str, text2: str) -> float:
+        """Async variant of calculate_semantic_similarity."""
+        return await asyncio.to_thread(self.calculate_semantic_similarity, text1, text2)
+    
+    async def a_extract_key_phrases(self, text: str, top_n: int = 10) -> List[Tuple[str, float]]:
+        """Async variant of extract_key_phrases."""
+        return await asyncio.to_thread(self.extract_key_phrases, text, top_n)
+    
+    async def a_extract_entities(self, text: str) -> Dict[str, List[str]]:
+        """Async variant of extract_entities."""
+        return await asyncio.to_thread(self.extract_entities, text)
+
+@lru_cache(maxsize=1)
+def get_nlp_service() -> NLPService:
+    """Shared NLPService, so the spaCy model and matchers load once per process."""
+    return NLPService()
@@ -2,11 +2,23 @@
 from typing import Dict, Any, Optional
 from datetime import datetime
 from app.core.websocket import manager
-import json
+import numpy as np
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Non-str keys are stringified as json.dumps did
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+def _json_default(obj: Any) -> Any:
+    """Convert numpy values (e.g. scores from the NLP services) for orjson."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 class NotificationService:
     """Service for managing real-time notifications."""
     
@@ -27,54 +39,61 @@ class NotificationService:
             "timestamp": datetime.now().isoformat(),
             "data": data or {}
         }
-        
+        return await NotificationService._deliver(user_id, notification)
+    
+    @staticmethod
+    async def _deliver(user_id: int, notification: Dict[str, Any]):
+        """Serialize a ready-built notification and push it to the user."""
         # Send via WebSocket if user is connected
         await manager.send_user_message(
-            json.dumps(notification),
+            orjson.dumps(notification, default=_json_default, option=_ORJSON_OPTIONS).decode(),
             user_id
         )
         
-        logger.info(f"Sent notification to user {user_id}: {title}")
+        logger.info(f"Sent notification to user {user_id}: {notification['title']}")
         return notification
     
     @staticmethod
     async def notify_analysis_complete(user_id: int, analysis_id: int, match_percentage: float):
         """Notify user when analysis is complete."""
-        return await NotificationService.send_notification(
-            user_id=user_id,
-            notification_type="analysis_complete",
-            title="Analysis Complete",
-            message=f"Your resume analysis is ready! Match: {match_percentage:.1f}%",
-            data={
+        return await NotificationService._deliver(user_id, {
+            "type": "notification",
+            "notification_type": "analysis_complete",
+            "title": "Analysis Complete",
+            "message": f"Your resume analysis is ready! Match: {match_percentage:.1f}%",
+            "timestamp": datetime.now().isoformat(),
+            "data": {
                 "analysis_id": analysis_id,
                 "match_percentage": match_percentage
             }
-        )
+        })
     
     @staticmethod
     async def notify_skill_trending(user_id: int, skill: str, trend: str):
         """Notify user about skill trends."""
-        return await NotificationService.send_notification(
-            user_id=user_id,
-            notification_type="skill_trend",
-            title="Skill Trend Alert",
-            message=f"{skill} is {trend} in demand",
-            data={
+        return await NotificationService._deliver(user_id, {
+            "type": "notification",
+            "notification_type": "skill_trend",
+            "title": "Skill Trend Alert",
+            "message": f"{skill} is {trend} in demand",
+            "timestamp": datetime.now().isoformat(),
+            "data": {
                 "skill": skill,
                 "trend": trend
             }
-        )
+        })
     
     @staticmethod
     async def notify_milestone(user_id: int, milestone: str, value: Any):
         """Notify user about reaching a milestone."""
-        return await NotificationService.send_notification(
-            user_id=user_id,
-            notification_type="milestone",
-            title="Milestone Reached!",
-            message=f"Congratulations! You've {milestone}",
-            data={
+        return await NotificationService._deliver(user_id, {
+            "type": "notification",
+            "notification_type": "milestone",
+            "title": "Milestone Reached!",
+            "message": f"Congratulations! You've {milestone}",
+            "timestamp": datetime.now().isoformat(),
+            "data": {
                 "milestone": milestone,
                 "value": value
             }
-        )
+        })
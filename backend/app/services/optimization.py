@@ -1,13 +1,94 @@
 """Resume optimization service."""
-from typing import Dict, List, Any
+from typing import Dict, List, Set, Any, Iterable, Optional
+from collections import Counter
+from functools import lru_cache
 import re
-from app.services.nlp_service import NLPService
+import ahocorasick
+import numpy as np
+from app.services.nlp_service import get_nlp_service
+
+# Section keywords, searched in the lowercased resume
+_SECTION_PATTERNS = {
+    section: re.compile(pattern)
+    for section, pattern in {
+        "contact": r"(email|phone|linkedin|github)",
+        "summary": r"(summary|objective|profile)",
+        "experience": r"(experience|work history|employment)",
+        "education": r"(education|academic|degree)",
+        "skills": r"(skills|technical|competencies)"
+    }.items()
+}
+
+# Achievement verbs that usually deserve a number
+_QUANT_PATTERNS = [
+    (re.compile(r"improved"), "Consider quantifying: 'improved by X%'"),
+    (re.compile(r"reduced"), "Consider quantifying: 'reduced by X% or $X'"),
+    (re.compile(r"increased"), "Consider quantifying: 'increased by X%'"),
+    (re.compile(r"managed"), "Consider quantifying: 'managed X people/projects'"),
+    (re.compile(r"led"), "Consider quantifying: 'led team of X'"),
+    (re.compile(r"developed"), "Consider quantifying: 'developed X features/projects'")
+]
+
+_DIGIT_RE = re.compile(r"\d+")
+_WORD_RE = re.compile(r"\w+")
+
+# Symbols that ATS parsers tend to mangle
+_ATS_SPECIAL_CHARS = frozenset('©®™♦★')
+
+# Weak verbs as whole words, so "networked" doesn't count as "worked"
+_WEAK_VERBS = ["worked", "helped", "did", "made", "got", "had", "was", "were"]
+_WEAK_VERB_RE = re.compile(r"\b(" + "|".join(_WEAK_VERBS) + r")\b")
+
+# Short forms that stand in for a full keyword, and the reverse index
+_KEYWORD_VARIANTS = {
+    "javascript": ["js", "node.js", "nodejs"],
+    "python": ["py", "python3"],
+    "kubernetes": ["k8s"],
+    "continuous integration": ["ci/cd", "ci"],
+    "machine learning": ["ml", "deep learning"]
+}
+_VARIANT_KEYWORDS = {
+    variant: keyword for keyword, variants in _KEYWORD_VARIANTS.items() for variant in variants
+}
+
+def _build_automaton(terms: Iterable[str]) -> ahocorasick.Automaton:
+    """Aho-Corasick automaton whose matches report the matched term."""
+    automaton = ahocorasick.Automaton()
+    for term in terms:
+        if term:
+            automaton.add_word(term, term)
+    if len(automaton):
+        automaton.make_automaton()
+    return automaton
+
+_VARIANT_AUTOMATON = _build_automaton(_VARIANT_KEYWORDS)
+
+def _optimization_score(keyword_match, section_count, text_length):
+    """Overall optimization score from its inputs.
+    
+    Only arithmetic and elementwise operators, so the same function scores a
+    single resume or numpy arrays of many resumes at once.
+    """
+    score = 50  # Base score
+    score = score + keyword_match * 30  # Keyword match
+    score = score + section_count * 4  # Structure
+    score = score + 10 * ((500 < text_length) & (text_length < 3000))  # Length
+    
+    return np.minimum(100, np.asarray(score).astype(int))
+
+def _count_occurrences(text: str, terms: Iterable[str]) -> Counter:
+    """Count occurrences of each term in a single Aho-Corasick pass over text."""
+    automaton = _build_automaton(terms)
+    if not len(automaton):
+        return Counter()
+    
+    return Counter(term for _, term in automaton.iter(text))
 
 class ResumeOptimizer:
     """Optimize resume content for better matching."""
     
     def __init__(self):
-        self.nlp_service = NLPService()
+        self.nlp_service = get_nlp_service()
         
         # Action verbs for different contexts
         self.action_verbs = {
@@ -19,62 +100,101 @@ class ResumeOptimizer:
     
     def optimize_resume(self, resume_text: str, job_description: str) -> Dict[str, Any]:
         """Generate optimization suggestions for resume."""
+        # Skills are extracted once and shared by the keyword and score sections
+        jd_keywords, resume_keywords = self.nlp_service.extract_skills_batch(
+            [job_description, resume_text]
+        )
+        
+        # Lowercase the resume once for every case-insensitive check below
+        resume_lower = resume_text.lower()
         
         suggestions = {
-            "keyword_optimization": self._optimize_keywords(resume_text, job_description),
-            "structure_improvements": self._analyze_structure(resume_text),
-            "action_verb_suggestions": self._suggest_action_verbs(resume_text),
-            "quantification_opportunities": self._find_quantification_opportunities(resume_text),
+            "keyword_optimization": self._optimize_keywords(resume_text, jd_keywords, resume_keywords, resume_lower),
+            "structure_improvements": self._analyze_structure(resume_text, resume_lower),
+            "action_verb_suggestions": self._suggest_action_verbs(resume_text, resume_lower),
+            "quantification_opportunities": self._find_quantification_opportunities(resume_text, resume_lower),
             "formatting_tips": self._formatting_suggestions(resume_text),
-            "ats_optimization": self._ats_optimization(resume_text, job_description),
-            "overall_score": self._calculate_optimization_score(resume_text, job_description)
+            "ats_optimization": self._ats_optimization(resume_text, job_description, resume_lower),
+            "overall_score": self._calculate_optimization_score(resume_text, jd_keywords, resume_keywords, resume_lower)
         }
         
         return suggestions
     
-    def _optimize_keywords(self, resume_text: str, job_description: str) -> Dict[str, Any]:
-        """Optimize keywords for better matching."""
+    def score_resumes_batch(self, resumes: List[str], job_description: str, n_process: Optional[int] = None) -> List[int]:
+        """Overall optimization score of many resumes against one job description.
+        
+        Scores match optimize_resume's overall_score. Resume skills come from
+        extract_skills_bulk and the score is computed for all resumes at once
+        on numpy arrays, which suits ranking a large pool of candidates.
+        """
         jd_keywords = self.nlp_service.extract_skills_advanced(job_description)
-        resume_keywords = self.nlp_service.extract_skills_advanced(resume_text)
+        bulk_args = {} if n_process is None else {"n_process": n_process}
+        resume_keywords = self.nlp_service.extract_skills_bulk(resumes, **bulk_args)
+        
+        count = len(resumes)
+        matched = np.fromiter((len(jd_keywords & skills) for skills in resume_keywords), dtype=float, count=count)
+        keyword_match = matched / len(jd_keywords) if jd_keywords else np.zeros(count)
+        section_count = np.fromiter((len(self._detect_sections(resume)) for resume in resumes), dtype=int, count=count)
+        text_length = np.fromiter((len(resume) for resume in resumes), dtype=int, count=count)
+        
+        return _optimization_score(keyword_match, section_count, text_length).tolist()
+    
+    def _optimize_keywords(
+        self,
+        resume_text: str,
+        jd_keywords: Set[str],
+        resume_keywords: Set[str],
+        text_lower: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Optimize keywords for better matching."""
+        if text_lower is None:
+            text_lower = resume_text.lower()
         
         missing_keywords = [kw for kw in jd_keywords if kw not in resume_keywords]
         
         # Find keyword variations
-        keyword_variations = self._find_keyword_variations(missing_keywords, resume_text)
+        keyword_variations = self._find_keyword_variations(missing_keywords, resume_text, text_lower)
         
         return {
             "missing_keywords": missing_keywords[:10],
             "keyword_variations": keyword_variations,
-            "keyword_density": self._calculate_keyword_density(resume_text, jd_keywords),
+            "keyword_density": self._calculate_keyword_density(resume_text, jd_keywords, text_lower),
             "suggestions": self._generate_keyword_suggestions(missing_keywords)
         }
     
-    def _find_keyword_variations(self, keywords: List[str], text: str) -> Dict[str, str]:
+    def _find_keyword_variations(self, keywords: List[str], text: str, text_lower: Optional[str] = None) -> Dict[str, str]:
         """Find variations of keywords that might exist."""
         variations = {}
-        text_lower = text.lower()
-        
-        keyword_map = {
-            "javascript": ["js", "node.js", "nodejs"],
-            "python": ["py", "python3"],
-            "kubernetes": ["k8s"],
-            "continuous integration": ["ci/cd", "ci"],
-            "machine learning": ["ml", "deep learning"]
-        }
+        if text_lower is None:
+            text_lower = text.lower()
         
-        for keyword in keywords:
-            if keyword in keyword_map:
-                for variant in keyword_map[keyword]:
-                    if variant in text_lower:
-                        variations[keyword] = f"Found as '{variant}' - consider using full term"
+        wanted = {keyword for keyword in keywords if keyword in _KEYWORD_VARIANTS}
+        if not wanted:
+            return variations
+        
+        # One pass over the text finds every variant; keep those whose full
+        # term is missing, the last listed variant winning as before
+        found = {variant for _, variant in _VARIANT_AUTOMATON.iter(text_lower)}
+        for variant, keyword in _VARIANT_KEYWORDS.items():
+            if keyword in wanted and variant in found:
+                variations[keyword] = f"Found as '{variant}' - consider using full term"
         
         return variations
     
-    def _calculate_keyword_density(self, text: str, keywords: List[str]) -> float:
+    def _calculate_keyword_density(self, text: str, keywords: List[str], text_lower: Optional[str] = None) -> float:
         """Calculate keyword density."""
-        text_lower = text.lower()
-        total_words = len(text.split())
-        keyword_count = sum(text_lower.count(kw) for kw in keywords)
+        if text_lower is None:
+            text_lower = text.lower()
+        tokens = _WORD_RE.findall(text_lower)
+        total_words = len(tokens)
+        
+        # Single-word keywords count as whole tokens, so "java" isn't found in
+        # "javascript"; keywords like "node.js" or "c++" use a substring scan
+        token_counts = Counter(tokens)
+        words = [kw for kw in keywords if _WORD_RE.fullmatch(kw)]
+        phrases = [kw for kw in keywords if not _WORD_RE.fullmatch(kw)]
+        phrase_counts = _count_occurrences(text_lower, phrases)
+        keyword_count = sum(token_counts[kw] for kw in words) + sum(phrase_counts[kw] for kw in phrases)
         
         return round((keyword_count / total_words) * 100, 2) if total_words > 0 else 0
     
@@ -87,9 +207,9 @@ class ResumeOptimizer:
         
         return suggestions
     
-    def _analyze_structure(self, resume_text: str) -> Dict[str, Any]:
+    def _analyze_structure(self, resume_text: str, text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Analyze resume structure."""
-        sections = self._detect_sections(resume_text)
+        sections = self._detect_sections(resume_text, text_lower)
         
         recommended_sections = ["contact", "summary", "experience", "education", "skills"]
         missing_sections = [s for s in recommended_sections if s not in sections]
@@ -101,20 +221,14 @@ class ResumeOptimizer:
             "improvements": self._structure_improvements(sections, missing_sections)
         }
     
-    def _detect_sections(self, text: str) -> List[str]:
+    def _detect_sections(self, text: str, text_lower: Optional[str] = None) -> List[str]:
         """Detect sections in resume."""
         sections = []
-        section_patterns = {
-            "contact": r"(email|phone|linkedin|github)",
-            "summary": r"(summary|objective|profile)",
-            "experience": r"(experience|work history|employment)",
-            "education": r"(education|academic|degree)",
-            "skills": r"(skills|technical|competencies)"
-        }
         
-        text_lower = text.lower()
-        for section, pattern in section_patterns.items():
-            if re.search(pattern, text_lower):
+        if text_lower is None:
+            text_lower = text.lower()
+        for section, pattern in _SECTION_PATTERNS.items():
+            if pattern.search(text_lower):
                 sections.append(section)
         
         return sections
@@ -132,16 +246,13 @@ class ResumeOptimizer:
         
         return improvements
     
-    def _suggest_action_verbs(self, resume_text: str) -> Dict[str, Any]:
+    def _suggest_action_verbs(self, resume_text: str, text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Suggest stronger action verbs."""
-        weak_verbs = ["worked", "helped", "did", "made", "got", "had", "was", "were"]
+        if text_lower is None:
+            text_lower = resume_text.lower()
         
-        found_weak_verbs = []
-        text_lower = resume_text.lower()
-        
-        for verb in weak_verbs:
-            if verb in text_lower:
-                found_weak_verbs.append(verb)
+        found = set(_WEAK_VERB_RE.findall(text_lower))
+        found_weak_verbs = [verb for verb in _WEAK_VERBS if verb in found]
         
         replacements = {
             "worked": self.action_verbs["technical"],
@@ -157,22 +268,18 @@ class ResumeOptimizer:
             "power_verbs": self.action_verbs["achievement"][:10]
         }
     
-    def _find_quantification_opportunities(self, resume_text: str) -> List[str]:
+    def _find_quantification_opportunities(self, resume_text: str, text_lower: Optional[str] = None) -> List[str]:
         """Find opportunities to add quantification."""
         opportunities = []
         
-        patterns = [
-            (r"improved", "Consider quantifying: 'improved by X%'"),
-            (r"reduced", "Consider quantifying: 'reduced by X% or $X'"),
-            (r"increased", "Consider quantifying: 'increased by X%'"),
-            (r"managed", "Consider quantifying: 'managed X people/projects'"),
-            (r"led", "Consider quantifying: 'led team of X'"),
-            (r"developed", "Consider quantifying: 'developed X features/projects'")
-        ]
-        
-        text_lower = resume_text.lower()
-        for pattern, suggestion in patterns:
-            if re.search(pattern, text_lower) and not re.search(r"\d+", text_lower):
+        if text_lower is None:
+            text_lower = resume_text.lower()
+        # Any number in the resume already counts as quantified
+        if _DIGIT_RE.search(text_lower):
+            return opportunities
+        
+        for pattern, suggestion in _QUANT_PATTERNS:
+            if pattern.search(text_lower):
                 opportunities.append(suggestion)
         
         return opportunities[:5]
@@ -200,26 +307,26 @@ class ResumeOptimizer:
         
         return suggestions
     
-    def _ats_optimization(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+    def _ats_optimization(self, resume_text: str, job_description: str, text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Optimize for ATS (Applicant Tracking System)."""
+        if text_lower is None:
+            text_lower = resume_text.lower()
         
         ats_issues = []
         ats_score = 100
         
         # Check for tables (ATS unfriendly)
-        if "table" in resume_text.lower() or "|" in resume_text:
+        if "table" in text_lower or "|" in resume_text:
             ats_issues.append("Avoid tables - use simple formatting")
             ats_score -= 20
         
         # Check for special characters
-        special_chars = ['©', '®', '™', '♦', '★']
-        if any(char in resume_text for char in special_chars):
+        if not _ATS_SPECIAL_CHARS.isdisjoint(resume_text):
             ats_issues.append("Remove special characters")
             ats_score -= 10
         
         # Check for standard sections
         standard_sections = ["experience", "education", "skills"]
-        text_lower = resume_text.lower()
         for section in standard_sections:
             if section not in text_lower:
                 ats_issues.append(f"Add standard section: {section}")
@@ -236,22 +343,20 @@ class ResumeOptimizer:
             ]
         }
     
-    def _calculate_optimization_score(self, resume_text: str, job_description: str) -> int:
+    def _calculate_optimization_score(
+        self,
+        resume_text: str,
+        jd_keywords: Set[str],
+        resume_keywords: Set[str],
+        text_lower: Optional[str] = None
+    ) -> int:
         """Calculate overall optimization score."""
-        score = 50  # Base score
-        
-        # Keyword match
-        jd_keywords = self.nlp_service.extract_skills_advanced(job_description)
-        resume_keywords = self.nlp_service.extract_skills_advanced(resume_text)
-        keyword_match = len([kw for kw in jd_keywords if kw in resume_keywords]) / len(jd_keywords) if jd_keywords else 0
-        score += keyword_match * 30
+        keyword_match = len(jd_keywords & resume_keywords) / len(jd_keywords) if jd_keywords else 0
+        sections = self._detect_sections(resume_text, text_lower)
         
-        # Structure
-        sections = self._detect_sections(resume_text)
-        score += len(sections) * 4
-        
-        # Length
-        if 500 < len(resume_text) < 3000:
-            score += 10
-        
-        return min(100, int(score))
+        return int(_optimization_score(keyword_match, len(sections), len(resume_text)))
+
+@lru_cache(maxsize=1)
+def get_resume_optimizer() -> ResumeOptimizer:
+    """Shared ResumeOptimizer instance."""
+    return ResumeOptimizer()
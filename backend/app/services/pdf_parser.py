@@ -1,89 +1,200 @@
 """PDF parsing service for resume extraction."""
+import hashlib
 import io
+import os
 import re
-from typing import Optional, Dict, Any
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 import PyPDF2
 import pdfplumber
+import pypdfium2 as pdfium
+from pdfminer.pdfparser import PDFSyntaxError
+from pdfminer.psparser import PSException
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Digests of PDFs that every extractor either found no text in or rejected as
+# malformed, so a re-upload of the same file is rejected without running the
+# whole extractor chain again. Attempts that hit any other error are not
+# recorded, so a retry after a transient failure runs the extractors again
+UNREADABLE_PDF_CACHE_SIZE = int(os.getenv("UNREADABLE_PDF_CACHE_SIZE", "1024"))
+
+_unreadable_pdfs: OrderedDict = OrderedDict()
+_unreadable_pdfs_lock = threading.Lock()
+
+# PDFium is not thread-safe; calls into it from different threads must not overlap
+_pdfium_lock = threading.Lock()
+
+# Raised by the extractors for files they cannot parse; the same bytes fail
+# the same way every time
+_PDF_PARSE_ERRORS = (pdfium.PdfiumError, PyPDF2.errors.PdfReadError, PDFSyntaxError, PSException)
+
+def _join_pages(pages: List[str]) -> str:
+    """Join the non-empty page texts with newlines into a single buffer."""
+    buf = io.StringIO()
+    for page in pages:
+        if page:
+            if buf.tell():
+                buf.write('\n')
+            buf.write(page)
+    return buf.getvalue()
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_CAMEL_CASE_RE = re.compile(r'([a-z])([A-Z])')
+_BULLET_RE = re.compile(r'(\w)([•●▪])')
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+
+# Section headers that get their own line back after whitespace collapsing,
+# as one alternation so the text is scanned once
+_SECTION_HEADER_RE = re.compile(
+    '(' + '|'.join([
+        'EXPERIENCE', 'EDUCATION', 'SKILLS', 'SUMMARY', 'OBJECTIVE',
+        'PROJECTS', 'CERTIFICATIONS', 'ACHIEVEMENTS', 'REFERENCES'
+    ]) + ')',
+    re.IGNORECASE
+)
+
+# Words of which a resume is expected to contain at least two
+_RESUME_INDICATORS = ('experience', 'education', 'skills', 'work', 'professional')
+
+# Upload content types accepted by DocumentProcessor; checked before the body is read
+_SUPPORTED_CONTENT_TYPES = frozenset({
+    'application/pdf',
+    'text/plain',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+})
+
+# Every PDF file starts with this marker (readers allow junk before it)
+_PDF_HEADER = b'%PDF-'
+
+# Contact information patterns used to validate a resume
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}')
+
 class PDFParser:
     """Service for parsing PDF resumes."""
     
     def extract_text_from_pdf(self, pdf_file: bytes) -> Optional[str]:
         """Extract text from PDF file."""
+        digest = hashlib.blake2b(pdf_file, digest_size=16).digest()
+        with _unreadable_pdfs_lock:
+            if digest in _unreadable_pdfs:
+                _unreadable_pdfs.move_to_end(digest)
+                return None
+        
+        text, complete = self._extract_text(pdf_file)
+        if text is None and complete:
+            with _unreadable_pdfs_lock:
+                _unreadable_pdfs[digest] = None
+                while len(_unreadable_pdfs) > UNREADABLE_PDF_CACHE_SIZE:
+                    _unreadable_pdfs.popitem(last=False)
+        return text
+    
+    def _extract_text(self, pdf_file: bytes) -> Tuple[Optional[str], bool]:
+        """Run the extractors in turn until one finds enough text.
+        
+        Also returns whether every extractor that ran gave a final answer, so
+        a None text can be told apart from a failed attempt.
+        """
         try:
-            # Try with pdfplumber first (better for complex layouts)
-            text = self._extract_with_pdfplumber(pdf_file)
+            # PDFium (C++) reads most files far faster than pdfminer's pure
+            # Python layout analysis; the other extractors cover the rest
+            pages, complete = self._run_extractor("pdfium", self._extract_with_pdfium, pdf_file)
+            text = _join_pages(pages) if pages else None
             if text and len(text) > 100:
-                return self._clean_extracted_text(text)
+                return self._clean_extracted_text(text), complete
             
-            # Fallback to PyPDF2
-            text = self._extract_with_pypdf2(pdf_file)
+            # Try with pdfplumber next (better for complex layouts)
+            pages, final = self._run_extractor("pdfplumber", self._extract_with_pdfplumber, pdf_file)
+            complete = complete and final
+            text = _join_pages(pages) if pages else None
+            if text and len(text) > 100:
+                return self._clean_extracted_text(text), complete
+            
+            # Fallback to PyPDF2, re-reading only the pages pdfplumber got no
+            # text from (every page if pdfplumber could not open the file)
+            if pages is None:
+                pages, final = self._run_extractor("PyPDF2", self._extract_with_pypdf2, pdf_file)
+                complete = complete and final
+                pages = pages or []
+            else:
+                missing = [i for i, page in enumerate(pages) if not page]
+                if missing:
+                    recovered, final = self._run_extractor("PyPDF2", self._extract_with_pypdf2, pdf_file, missing)
+                    complete = complete and final
+                    for i, page in zip(missing, recovered or []):
+                        pages[i] = page
+            
+            text = _join_pages(pages)
             if text:
-                return self._clean_extracted_text(text)
+                return self._clean_extracted_text(text), complete
             
-            return None
+            return None, complete
             
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
-            return None
+            return None, False
     
-    def _extract_with_pdfplumber(self, pdf_file: bytes) -> Optional[str]:
-        """Extract text using pdfplumber."""
+    def _run_extractor(self, name: str, extract, *args) -> Tuple[Optional[List[str]], bool]:
+        """Run one extractor, returning its pages and whether that result is final.
+        
+        A file the extractor cannot parse gives a final None; any other error
+        (out of memory, I/O, a library bug) may not recur, so its None is not.
+        """
         try:
-            text_parts = []
-            with pdfplumber.open(io.BytesIO(pdf_file)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-            
-            return '\n'.join(text_parts) if text_parts else None
-            
+            return extract(*args), True
+        except _PDF_PARSE_ERRORS as e:
+            logger.warning(f"{name} could not parse the PDF: {e}")
+            return None, True
         except Exception as e:
-            logger.warning(f"pdfplumber extraction failed: {e}")
-            return None
+            logger.warning(f"{name} extraction failed: {e}")
+            return None, False
     
-    def _extract_with_pypdf2(self, pdf_file: bytes) -> Optional[str]:
-        """Extract text using PyPDF2."""
-        try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file))
-            text_parts = []
-            
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
-            
-            return '\n'.join(text_parts) if text_parts else None
-            
-        except Exception as e:
-            logger.warning(f"PyPDF2 extraction failed: {e}")
-            return None
+    def _extract_with_pdfium(self, pdf_file: bytes) -> List[str]:
+        """Extract the text of each page using pypdfium2 ('' for pages without text)."""
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(pdf_file)
+            try:
+                pages = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                return pages
+            finally:
+                pdf.close()
+    
+    def _extract_with_pdfplumber(self, pdf_file: bytes) -> List[str]:
+        """Extract the text of each page using pdfplumber ('' for pages without text)."""
+        with pdfplumber.open(io.BytesIO(pdf_file)) as pdf:
+            return [page.extract_text() or '' for page in pdf.pages]
+    
+    def _extract_with_pypdf2(self, pdf_file: bytes, page_numbers: Optional[List[int]] = None) -> List[str]:
+        """Extract the text of the given pages (all by default) using PyPDF2."""
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file))
+        if page_numbers is None:
+            page_numbers = range(len(pdf_reader.pages))
+        
+        return [pdf_reader.pages[page_num].extract_text() or '' for page_num in page_numbers]
     
     def _clean_extracted_text(self, text: str) -> str:
         """Clean and format extracted text."""
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         # Fix common extraction issues
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)  # Add space between camelCase
-        text = re.sub(r'(\w)([•●▪])', r'\1 \2', text)  # Add space before bullets
+        text = _CAMEL_CASE_RE.sub(r'\1 \2', text)  # Add space between camelCase
+        text = _BULLET_RE.sub(r'\1 \2', text)  # Add space before bullets
         
         # Restore line breaks for common sections
-        section_headers = [
-            'EXPERIENCE', 'EDUCATION', 'SKILLS', 'SUMMARY', 'OBJECTIVE',
-            'PROJECTS', 'CERTIFICATIONS', 'ACHIEVEMENTS', 'REFERENCES'
-        ]
-        
-        for header in section_headers:
-            text = re.sub(f'({header})', r'\n\n\1\n', text, flags=re.IGNORECASE)
+        text = _SECTION_HEADER_RE.sub(r'\n\n\1\n', text)
         
         # Clean up multiple line breaks
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _MULTI_NEWLINE_RE.sub('\n\n', text)
         
         return text.strip()
     
@@ -101,23 +212,18 @@ class PDFParser:
             validation["issues"].append("Text too short to be a valid resume")
             validation["confidence"] -= 50
         
-        # Check for resume indicators
-        resume_indicators = ['experience', 'education', 'skills', 'work', 'professional']
+        # Check for resume indicators; two are enough, so stop scanning there
         text_lower = text.lower()
-        
-        indicator_count = sum(1 for indicator in resume_indicators if indicator in text_lower)
-        if indicator_count < 2:
+        found = (indicator for indicator in _RESUME_INDICATORS if indicator in text_lower)
+        if next(found, None) is None or next(found, None) is None:
             validation["issues"].append("Missing common resume sections")
             validation["confidence"] -= 30
         
-        # Check for contact information patterns
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}'
-        
-        has_email = bool(re.search(email_pattern, text))
-        has_phone = bool(re.search(phone_pattern, text))
+        # Check for contact information patterns; the phone pattern is the
+        # costlier scan, so it only runs when no email was found
+        has_contact = bool(_EMAIL_RE.search(text) or _PHONE_RE.search(text))
         
-        if not has_email and not has_phone:
+        if not has_contact:
             validation["issues"].append("No contact information found")
             validation["confidence"] -= 20
         
@@ -127,11 +233,16 @@ class PDFParser:
         
         return validation
 
+@lru_cache(maxsize=1)
+def get_pdf_parser() -> PDFParser:
+    """Shared PDFParser instance."""
+    return PDFParser()
+
 class DocumentProcessor:
     """Process various document formats."""
     
     def __init__(self):
-        self.pdf_parser = PDFParser()
+        self.pdf_parser = get_pdf_parser()
         self.supported_formats = ['.pdf', '.txt', '.docx']
     
     def process_document(self, file_content: bytes, file_type: str) -> Optional[str]:
@@ -139,15 +250,19 @@ class DocumentProcessor:
         if file_type == 'application/pdf':
             return self.pdf_parser.extract_text_from_pdf(file_content)
         elif file_type == 'text/plain':
+            # Plain text is decoded directly; only a PDF sent as text/plain
+            # (header within the first 1 KB) goes to the PDF parser
+            if _PDF_HEADER in file_content[:1024]:
+                return self.pdf_parser.extract_text_from_pdf(file_content)
             return file_content.decode('utf-8', errors='ignore')
         else:
             return None
     
     def is_supported_format(self, file_type: str) -> bool:
         """Check if file format is supported."""
-        supported_types = [
-            'application/pdf',
-            'text/plain',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        ]
-        return file_type in supported_types
+        return file_type in _SUPPORTED_CONTENT_TYPES
+
+@lru_cache(maxsize=1)
+def get_document_processor() -> DocumentProcessor:
+    """Shared DocumentProcessor instance."""
+    return DocumentProcessor()
@@ -1,9 +1,42 @@
 """Resume template and export service."""
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import json
 from fpdf import FPDF
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 import io
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_DIR = os.path.join(os.path.dirname(__file__), "resume_layouts")
+
+# Opt-in directory for compiled layout bytecode, so new worker processes skip
+# parsing the layouts
+JINJA_BYTECODE_CACHE_DIR = os.getenv("JINJA_BYTECODE_CACHE_DIR")
+
+def _layout_bytecode_cache() -> Optional[BytecodeCache]:
+    """Bytecode cache in JINJA_BYTECODE_CACHE_DIR, or None if unset or unusable."""
+    if not JINJA_BYTECODE_CACHE_DIR:
+        return None
+    try:
+        os.makedirs(JINJA_BYTECODE_CACHE_DIR, exist_ok=True)
+        if not os.access(JINJA_BYTECODE_CACHE_DIR, os.W_OK):
+            raise OSError(f"{JINJA_BYTECODE_CACHE_DIR} is not writable")
+        return FileSystemBytecodeCache(JINJA_BYTECODE_CACHE_DIR)
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Template bytecode cache disabled: {e}")
+        return None
+
+# HTML layouts are compiled once and autoescape user-supplied resume data
+_layouts = Environment(
+    loader=FileSystemLoader(LAYOUT_DIR),
+    autoescape=select_autoescape(["html", "j2"]),
+    auto_reload=False,
+    bytecode_cache=_layout_bytecode_cache()
+)
 
 class ResumeTemplate:
     """Base class for resume templates."""
@@ -30,118 +63,15 @@ class ModernTemplate(ResumeTemplate):
             "Modern",
             "Clean and modern design with emphasis on skills"
         )
+        self.html_template = _layouts.get_template("modern.html.j2")
     
     def generate_html(self, data: Dict[str, Any]) -> str:
         """Generate HTML resume."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                h1 {{
-                    color: #2C3E50;
-                    border-bottom: 3px solid #3498DB;
-                    padding-bottom: 10px;
-                }}
-                h2 {{
-                    color: #34495E;
-                    margin-top: 25px;
-                    border-bottom: 1px solid #BDC3C7;
-                    padding-bottom: 5px;
-                }}
-                .contact-info {{
-                    color: #7F8C8D;
-                    margin-bottom: 20px;
-                }}
-                .skills {{
-                    display: flex;
-                    flex-wrap: wrap;
-                    gap: 10px;
-                    margin: 10px 0;
-                }}
-                .skill-tag {{
-                    background-color: #3498DB;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    font-size: 14px;
-                }}
-                .experience-item {{
-                    margin-bottom: 20px;
-                }}
-                .date {{
-                    color: #7F8C8D;
-                    font-style: italic;
-                }}
-            </style>
-        </head>
-        <body>
-            <h1>{data.get('name', 'Your Name')}</h1>
-            
-            <div class="contact-info">
-                {data.get('email', 'email@example.com')} | 
-                {data.get('phone', '123-456-7890')} | 
-                {data.get('location', 'City, State')}
-            </div>
-            
-            <h2>Professional Summary</h2>
-            <p>{data.get('summary', 'Professional summary goes here...')}</p>
-            
-            <h2>Skills</h2>
-            <div class="skills">
-                {self._generate_skills_html(data.get('skills', []))}
-            </div>
-            
-            <h2>Professional Experience</h2>
-            {self._generate_experience_html(data.get('experience', []))}
-            
-            <h2>Education</h2>
-            {self._generate_education_html(data.get('education', []))}
-        </body>
-        </html>
-        """
-    
-    def _generate_skills_html(self, skills: List[str]) -> str:
-        """Generate HTML for skills."""
-        return ''.join(f'<span class="skill-tag">{skill}</span>' for skill in skills)
-    
-    def _generate_experience_html(self, experience: List[Dict]) -> str:
-        """Generate HTML for experience."""
-        html = ""
-        for exp in experience:
-            html += f"""
-            <div class="experience-item">
-                <h3>{exp.get('title', 'Job Title')} - {exp.get('company', 'Company Name')}</h3>
-                <div class="date">{exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present')}</div>
-                <p>{exp.get('description', 'Job description...')}</p>
-            </div>
-            """
-        return html
-    
-    def _generate_education_html(self, education: List[Dict]) -> str:
-        """Generate HTML for education."""
-        html = ""
-        for edu in education:
-            html += f"""
-            <div>
-                <h3>{edu.get('degree', 'Degree')} - {edu.get('school', 'School Name')}</h3>
-                <div class="date">{edu.get('graduation_date', 'Graduation Date')}</div>
-            </div>
-            """
-        return html
+        return self.html_template.render(data)
     
     def generate_text(self, data: Dict[str, Any]) -> str:
         """Generate plain text resume."""
-        text = f"""
+        parts = [f"""
 {data.get('name', 'Your Name').upper()}
 {data.get('email', 'email@example.com')} | {data.get('phone', '123-456-7890')} | {data.get('location', 'City, State')}
 
@@ -152,22 +82,22 @@ SKILLS
 {', '.join(data.get('skills', []))}
 
 PROFESSIONAL EXPERIENCE
-"""
+"""]
         for exp in data.get('experience', []):
-            text += f"""
+            parts.append(f"""
 {exp.get('title', 'Job Title')} - {exp.get('company', 'Company Name')}
 {exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present')}
 {exp.get('description', 'Job description...')}
-"""
+""")
         
-        text += "\nEDUCATION\n"
+        parts.append("\nEDUCATION\n")
         for edu in data.get('education', []):
-            text += f"""
+            parts.append(f"""
 {edu.get('degree', 'Degree')} - {edu.get('school', 'School Name')}
 {edu.get('graduation_date', 'Graduation Date')}
-"""
+""")
         
-        return text
+        return "".join(parts)
 
 class ATSTemplate(ResumeTemplate):
     """ATS-friendly resume template."""
@@ -177,95 +107,16 @@ class ATSTemplate(ResumeTemplate):
             "ATS-Friendly",
             "Optimized for Applicant Tracking Systems"
         )
+        self.html_template = _layouts.get_template("ats.html.j2")
     
     def generate_html(self, data: Dict[str, Any]) -> str:
         """Generate ATS-friendly HTML."""
-        return f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: Arial, sans-serif;
-                    line-height: 1.5;
-                    color: #000;
-                    max-width: 800px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                h1, h2, h3 {{
-                    color: #000;
-                    font-weight: bold;
-                }}
-                h1 {{
-                    font-size: 24px;
-                    margin-bottom: 5px;
-                }}
-                h2 {{
-                    font-size: 18px;
-                    margin-top: 20px;
-                    margin-bottom: 10px;
-                    text-transform: uppercase;
-                }}
-                h3 {{
-                    font-size: 16px;
-                    margin-bottom: 5px;
-                }}
-                p, li {{
-                    margin: 5px 0;
-                }}
-                ul {{
-                    margin: 10px 0;
-                    padding-left: 20px;
-                }}
-            </style>
-        </head>
-        <body>
-            <h1>{data.get('name', 'Your Name')}</h1>
-            <p>{data.get('email', 'email@example.com')} | {data.get('phone', '123-456-7890')} | {data.get('location', 'City, State')}</p>
-            
-            <h2>Summary</h2>
-            <p>{data.get('summary', 'Professional summary goes here...')}</p>
-            
-            <h2>Skills</h2>
-            <p>{', '.join(data.get('skills', []))}</p>
-            
-            <h2>Experience</h2>
-            {self._generate_ats_experience(data.get('experience', []))}
-            
-            <h2>Education</h2>
-            {self._generate_ats_education(data.get('education', []))}
-        </body>
-        </html>
-        """
-    
-    def _generate_ats_experience(self, experience: List[Dict]) -> str:
-        """Generate ATS-friendly experience section."""
-        html = ""
-        for exp in experience:
-            html += f"""
-            <h3>{exp.get('title', 'Job Title')}</h3>
-            <p>{exp.get('company', 'Company Name')} | {exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present')}</p>
-            <ul>
-                <li>{exp.get('description', 'Job description...')}</li>
-            </ul>
-            """
-        return html
-    
-    def _generate_ats_education(self, education: List[Dict]) -> str:
-        """Generate ATS-friendly education section."""
-        html = ""
-        for edu in education:
-            html += f"""
-            <p><strong>{edu.get('degree', 'Degree')}</strong>, {edu.get('school', 'School Name')}, {edu.get('graduation_date', 'Graduation Date')}</p>
-            """
-        return html
+        return self.html_template.render(data)
     
     def generate_text(self, data: Dict[str, Any]) -> str:
         """Generate ATS-friendly plain text."""
         # Use the parent class implementation or create custom ATS version
-        text = f"""
+        parts = [f"""
 {data.get('name', 'Your Name').upper()}
 {data.get('email', 'email@example.com')} | {data.get('phone', '123-456-7890')} | {data.get('location', 'City, State')}
 
@@ -276,22 +127,22 @@ SKILLS
 {', '.join(data.get('skills', []))}
 
 EXPERIENCE
-"""
+"""]
         for exp in data.get('experience', []):
-            text += f"""
+            parts.append(f"""
 {exp.get('title', 'Job Title')}
 {exp.get('company', 'Company Name')}
 {exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present')}
 - {exp.get('description', 'Job description...')}
-"""
+""")
         
-        text += "\nEDUCATION\n"
+        parts.append("\nEDUCATION\n")
         for edu in data.get('education', []):
-            text += f"""
+            parts.append(f"""
 {edu.get('degree', 'Degree')}, {edu.get('school', 'School Name')}, {edu.get('graduation_date', 'Graduation Date')}
-"""
+""")
         
-        return text
+        return "".join(parts)
 
 class TemplateManager:
     """Manage resume templates."""
@@ -304,7 +155,7 @@ class TemplateManager:
     
     def get_template(self, template_name: str) -> ResumeTemplate:
         """Get a template by name."""
-        return self.templates.get(template_name, ModernTemplate())
+        return self.templates.get(template_name) or self.templates["modern"]
     
     def list_templates(self) -> List[Dict[str, str]]:
         """List available templates."""
@@ -327,4 +178,9 @@ class TemplateManager:
         elif format == "text":
             return template.generate_text(data)
         else:
-            raise ValueError(f"Unsupported format: {format}")
\ No newline at end of file
+            raise ValueError(f"Unsupported format: {format}")
+
+@lru_cache(maxsize=1)
+def get_template_manager() -> TemplateManager:
+    """Shared TemplateManager instance."""
+    return TemplateManager()
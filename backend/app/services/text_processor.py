@@ -1,10 +1,80 @@
 """Text processing utilities for resume and job description analysis."""
 import re
-from typing import List, Dict, Set
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Dict, Set, FrozenSet
 import logging
 
 logger = logging.getLogger(__name__)
 
+_PUNCT_RE = re.compile(r'[^\w\s\-\+\#\.\,\;\:\@]')
+_URL_RE = re.compile(r'http\S+|www.\S+')
+# A match can only begin where a whitespace-delimited token begins, so the
+# lookbehind rejects mid-token starting points without scanning them
+_EMAIL_RE = re.compile(r'(?<!\S)\S+@\S+')
+# Characters stripped from tokens: anything but word characters and -+#.
+# Whitespace is kept so the whole text can be stripped before splitting
+_TOKEN_PUNCT_RE = re.compile(r'[^\w\s\-\+\#]')
+_TOKEN_PUNCT_TABLE = str.maketrans('', '', ''.join(
+    char for char in map(chr, range(128))
+    if not (char.isalnum() or char.isspace() or char in '_-+#')
+))
+
+# Common section headers. They are searched in lowercased text, so they are
+# compiled case-sensitive: IGNORECASE stops re from scanning ahead for the
+# literal prefix and made each search about 5x slower
+_SECTION_PATTERNS = {
+    section: re.compile(pattern)
+    for section, pattern in {
+        'skills': r'(?:skills|technologies|technical skills|competencies)[\s\:]*',
+        'experience': r'(?:experience|work history|employment|professional experience)[\s\:]*',
+        'education': r'(?:education|academic|qualification|degree)[\s\:]*',
+        'requirements': r'(?:requirements|required|must have|qualifications)[\s\:]*',
+        'responsibilities': r'(?:responsibilities|duties|role|you will)[\s\:]*'
+    }.items()
+}
+
+# Common tech skills and keywords (expand this list)
+_TECH_KEYWORDS = frozenset({
+    # Programming Languages
+    'python', 'javascript', 'typescript', 'java', 'c++', 'c#', 'ruby', 'go', 'rust', 'swift',
+    'kotlin', 'scala', 'php', 'perl', 'r', 'matlab', 'sql', 'bash', 'powershell',
+    
+    # Frontend
+    'react', 'angular', 'vue', 'svelte', 'next.js', 'nuxt', 'gatsby', 'webpack', 'vite',
+    'html', 'css', 'sass', 'less', 'tailwind', 'bootstrap', 'material-ui', 'jquery',
+    
+    # Backend
+    'node.js', 'express', 'fastapi', 'django', 'flask', 'spring', 'rails', '.net', 'laravel',
+    
+    # Databases
+    'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb',
+    'sqlite', 'oracle', 'neo4j', 'firebase', 'supabase',
+    
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github', 'git',
+    'terraform', 'ansible', 'puppet', 'chef', 'circleci', 'travis', 'heroku', 'vercel',
+    
+    # Data & AI
+    'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'pandas',
+    'numpy', 'jupyter', 'tableau', 'power bi', 'spark', 'hadoop', 'airflow',
+    
+    # Other
+    'agile', 'scrum', 'jira', 'confluence', 'rest', 'graphql', 'api', 'microservices',
+    'ci/cd', 'tdd', 'linux', 'unix', 'windows', 'macos', 'mobile', 'ios', 'android'
+})
+
+# Multi-word terms can't be found by token lookup and are searched for in the
+# text; deriving them once means a call only scans for these few terms
+_COMPOUND_KEYWORDS = frozenset(keyword for keyword in _TECH_KEYWORDS if ' ' in keyword)
+
+# Skill groups behind generate_recommendations; priority skills are the
+# commonly important ones
+_PRIORITY_SKILLS = frozenset({'docker', 'kubernetes', 'aws', 'react', 'python', 'javascript'})
+_CLOUD_SKILLS = frozenset({'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform'})
+_FRONTEND_SKILLS = frozenset({'react', 'angular', 'vue', 'javascript', 'typescript', 'css'})
+_DATA_SKILLS = frozenset({'python', 'pandas', 'numpy', 'sql', 'tableau', 'machine learning'})
+
 class TextProcessor:
     """Handles text preprocessing and cleaning."""
     
@@ -12,13 +82,13 @@ class TextProcessor:
     def clean_text(text: str) -> str:
         """Clean and normalize text."""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = ' '.join(text.split())
         # Remove special characters but keep important ones
-        text = re.sub(r'[^\w\s\-\+\#\.\,\;\:\@]', '', text)
+        text = _PUNCT_RE.sub('', text)
         # Remove URLs
-        text = re.sub(r'http\S+|www.\S+', '', text)
+        text = _URL_RE.sub('', text)
         # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        text = _EMAIL_RE.sub('', text)
         return text.strip()
     
     @staticmethod
@@ -32,28 +102,23 @@ class TextProcessor:
             'responsibilities': ''
         }
         
-        # Common section headers
-        section_patterns = {
-            'skills': r'(?:skills|technologies|technical skills|competencies)[\s\:]*',
-            'experience': r'(?:experience|work history|employment|professional experience)[\s\:]*',
-            'education': r'(?:education|academic|qualification|degree)[\s\:]*',
-            'requirements': r'(?:requirements|required|must have|qualifications)[\s\:]*',
-            'responsibilities': r'(?:responsibilities|duties|role|you will)[\s\:]*'
-        }
-        
         text_lower = text.lower()
         
-        for section, pattern in section_patterns.items():
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            if match:
-                start = match.end()
+        # Scan the text once per header pattern; a section then ends at the
+        # first header of another kind after its own, found by bisection
+        headers = {section: list(pattern.finditer(text_lower)) for section, pattern in _SECTION_PATTERNS.items()}
+        header_starts = {section: [match.start() for match in matches] for section, matches in headers.items()}
+        
+        for section, matches in headers.items():
+            if matches:
+                start = matches[0].end()
                 # Find the next section or end of text
                 next_section_start = len(text)
-                for other_pattern in section_patterns.values():
-                    if other_pattern != pattern:
-                        next_match = re.search(other_pattern, text_lower[start:], re.IGNORECASE)
-                        if next_match:
-                            next_section_start = min(next_section_start, start + next_match.start())
+                for other, starts in header_starts.items():
+                    if other != section:
+                        index = bisect_left(starts, start)
+                        if index < len(starts):
+                            next_section_start = min(next_section_start, starts[index])
                 
                 sections[section] = text[start:next_section_start].strip()
         
@@ -62,63 +127,41 @@ class TextProcessor:
     @staticmethod
     def tokenize(text: str) -> List[str]:
         """Simple tokenization."""
-        # Convert to lowercase and split
-        tokens = text.lower().split()
-        # Remove punctuation from tokens
-        tokens = [re.sub(r'[^\w\-\+\#]', '', token) for token in tokens]
-        # Remove empty tokens
-        tokens = [token for token in tokens if token]
-        return tokens
+        return TextProcessor._tokenize_lower(text.lower())
+    
+    @staticmethod
+    def _tokenize_lower(text: str) -> List[str]:
+        """Tokenize text that is already lowercased."""
+        # Remove punctuation; str.translate has a fast path for ASCII text
+        if text.isascii():
+            text = text.translate(_TOKEN_PUNCT_TABLE)
+        else:
+            text = _TOKEN_PUNCT_RE.sub('', text)
+        # Split, dropping tokens that were only punctuation
+        return text.split()
     
     @staticmethod
     def extract_keywords(text: str, min_length: int = 2) -> Set[str]:
         """Extract potential keywords/skills from text."""
-        # Common tech skills and keywords (expand this list)
-        tech_keywords = {
-            # Programming Languages
-            'python', 'javascript', 'typescript', 'java', 'c++', 'c#', 'ruby', 'go', 'rust', 'swift',
-            'kotlin', 'scala', 'php', 'perl', 'r', 'matlab', 'sql', 'bash', 'powershell',
-            
-            # Frontend
-            'react', 'angular', 'vue', 'svelte', 'next.js', 'nuxt', 'gatsby', 'webpack', 'vite',
-            'html', 'css', 'sass', 'less', 'tailwind', 'bootstrap', 'material-ui', 'jquery',
-            
-            # Backend
-            'node.js', 'express', 'fastapi', 'django', 'flask', 'spring', 'rails', '.net', 'laravel',
-            
-            # Databases
-            'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb',
-            'sqlite', 'oracle', 'neo4j', 'firebase', 'supabase',
-            
-            # Cloud & DevOps
-            'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github', 'git',
-            'terraform', 'ansible', 'puppet', 'chef', 'circleci', 'travis', 'heroku', 'vercel',
-            
-            # Data & AI
-            'machine learning', 'deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'pandas',
-            'numpy', 'jupyter', 'tableau', 'power bi', 'spark', 'hadoop', 'airflow',
-            
-            # Other
-            'agile', 'scrum', 'jira', 'confluence', 'rest', 'graphql', 'api', 'microservices',
-            'ci/cd', 'tdd', 'linux', 'unix', 'windows', 'macos', 'mobile', 'ios', 'android'
-        }
-        
-        tokens = TextProcessor.tokenize(text)
-        keywords = set()
+        # The same resume or job description is often analyzed repeatedly;
+        # callers get a copy so they can't change the cached result
+        return set(TextProcessor._extract_keywords(text, min_length))
+    
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _extract_keywords(text: str, min_length: int) -> FrozenSet[str]:
+        """Keyword extraction behind extract_keywords, memoised per text."""
+        # Lowercase once for both the token and the compound term checks
+        text_lower = text.lower()
+        tokens = TextProcessor._tokenize_lower(text_lower)
         
         # Check for exact matches
-        for token in tokens:
-            if len(token) >= min_length:
-                if token in tech_keywords:
-                    keywords.add(token)
+        keywords = {token for token in tokens if len(token) >= min_length and token in _TECH_KEYWORDS}
         
         # Check for compound terms (like "machine learning")
-        text_lower = text.lower()
-        for keyword in tech_keywords:
-            if ' ' in keyword and keyword in text_lower:
-                keywords.add(keyword)
+        keywords.update(keyword for keyword in _COMPOUND_KEYWORDS if keyword in text_lower)
         
-        return keywords
+        return frozenset(keywords)
 
 
 class SkillMatcher:
@@ -137,40 +180,36 @@ class SkillMatcher:
     def categorize_skills(resume_skills: Set[str], jd_skills: Set[str]) -> Dict[str, List[str]]:
         """Categorize skills into matching, gaps, and unique."""
         return {
-            'matching': sorted(list(resume_skills.intersection(jd_skills))),
-            'gaps': sorted(list(jd_skills - resume_skills)),
-            'unique': sorted(list(resume_skills - jd_skills))
+            'matching': sorted(resume_skills & jd_skills),
+            'gaps': sorted(jd_skills - resume_skills),
+            'unique': sorted(resume_skills - jd_skills)
         }
     
     @staticmethod
     def generate_recommendations(skill_gaps: List[str]) -> List[str]:
         """Generate recommendations based on skill gaps."""
+        if not skill_gaps:
+            return ["Great match! Your skills align well with the job requirements."]
+        
         recommendations = []
+        gaps = frozenset(skill_gaps)
         
-        if not skill_gaps:
-            recommendations.append("Great match! Your skills align well with the job requirements.")
-        else:
-            # Priority skills (commonly important)
-            priority_skills = {'docker', 'kubernetes', 'aws', 'react', 'python', 'javascript'}
-            priority_gaps = [skill for skill in skill_gaps if skill in priority_skills]
-            
-            if priority_gaps:
-                recommendations.append(f"Priority skills to focus on: {', '.join(priority_gaps[:3])}")
-            
-            if len(skill_gaps) > 5:
-                recommendations.append(f"Consider focusing on the top {min(5, len(skill_gaps))} missing skills first")
-            
-            # Skill category recommendations
-            cloud_skills = {'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform'}
-            if any(skill in skill_gaps for skill in cloud_skills):
-                recommendations.append("Consider gaining cloud/DevOps experience through hands-on projects")
-            
-            frontend_skills = {'react', 'angular', 'vue', 'javascript', 'typescript', 'css'}
-            if any(skill in skill_gaps for skill in frontend_skills):
-                recommendations.append("Strengthen your frontend development skills with modern frameworks")
-            
-            data_skills = {'python', 'pandas', 'numpy', 'sql', 'tableau', 'machine learning'}
-            if any(skill in skill_gaps for skill in data_skills):
-                recommendations.append("Data analysis skills are in high demand - consider online courses")
+        # Only list priority gaps (in the caller's order) when there are any
+        if not _PRIORITY_SKILLS.isdisjoint(gaps):
+            priority_gaps = [skill for skill in skill_gaps if skill in _PRIORITY_SKILLS]
+            recommendations.append(f"Priority skills to focus on: {', '.join(priority_gaps[:3])}")
+        
+        if len(skill_gaps) > 5:
+            recommendations.append(f"Consider focusing on the top {min(5, len(skill_gaps))} missing skills first")
+        
+        # Skill category recommendations
+        if not _CLOUD_SKILLS.isdisjoint(gaps):
+            recommendations.append("Consider gaining cloud/DevOps experience through hands-on projects")
+        
+        if not _FRONTEND_SKILLS.isdisjoint(gaps):
+            recommendations.append("Strengthen your frontend development skills with modern frameworks")
+        
+        if not _DATA_SKILLS.isdisjoint(gaps):
+            recommendations.append("Data analysis skills are in high demand - consider online courses")
         
         return recommendations[:5]  # Limit to 5 recommendations
@@ -21,9 +21,9 @@ echo "📦 Installing dependencies..."
 pip install -q -r requirements.txt
 pip install -q -r requirements-dev.txt
 
-# Run tests
+# Run tests (set PYTEST_WORKERS=auto or a number to spread them over processes)
 echo "🚀 Running pytest..."
-pytest -v --cov=app --cov-report=term-missing
+pytest -v -n "${PYTEST_WORKERS:-0}" --cov=app --cov-report=term-missing
 
 # Capture exit code
 TEST_EXIT_CODE=$?
@@ -4,19 +4,42 @@ from pathlib import Path
 # Add backend to path BEFORE any app imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import asyncio
+from datetime import timedelta
+import httpx
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.core.database import Base, get_db
 from app.main import app
-from app.core.auth import get_password_hash
+from app.core.auth import (
+    ACCESS_TOKEN_EXPIRE_MINUTES, create_access_token, get_password_hash, pwd_context
+)
 from app.models.user import User
 
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Test database, in memory; StaticPool hands every checkout the same
+# connection so the schema and data are visible to all sessions
+SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+
+# Let SQLAlchemy issue BEGIN itself: pysqlite otherwise delays it, and a
+# SAVEPOINT outside a real transaction would commit when released
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _begin_transaction(connection):
+    connection.exec_driver_sql("BEGIN")
+
+# Sessions join the per-test transaction; their commits only release a savepoint
+TestingSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, join_transaction_mode="create_savepoint"
+)
 
 def override_get_db():
     try:
@@ -27,16 +50,60 @@ def override_get_db():
 
 app.dependency_overrides[get_db] = override_get_db
 
-@pytest.fixture(scope="function")
-def client():
+# Real bcrypt at its minimum cost: the hash and verify calls in login and
+# registration tests take about a millisecond instead of a third of a second
+pwd_context.update(bcrypt__rounds=4)
+
+@pytest.fixture(scope="session")
+def db_schema():
+    """Create the schema once for the whole test session."""
     Base.metadata.create_all(bind=engine)
-    yield TestClient(app)
+    yield
     Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture(scope="function")
-def test_user(client):
-    """Create a test user."""
-    db = TestingSessionLocal()
+def db_connection(db_schema):
+    """Run each test in a transaction that is rolled back afterwards."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    TestingSessionLocal.configure(bind=connection)
+    yield connection
+    TestingSessionLocal.configure(bind=engine)
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture(scope="session")
+def session_client(db_schema):
+    """TestClient shared by every test."""
+    return TestClient(app)
+
+@pytest.fixture(scope="function")
+def client(session_client, db_connection):
+    return session_client
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the session, so async fixtures can outlive a test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(scope="session")
+async def session_async_client(db_schema):
+    """Async client calling the app in-process over a reused ASGI transport."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as async_client:
+        yield async_client
+
+@pytest.fixture(scope="function")
+def async_client(session_async_client, db_connection):
+    return session_async_client
+
+@pytest.fixture(scope="session")
+def test_user(db_schema):
+    """Create a test user, committed once outside the per-test transactions."""
+    db = TestingSessionLocal(bind=engine)
     user = User(
         email="test@example.com",
         username="testuser",
@@ -50,26 +117,16 @@ def test_user(client):
     db.close()
     return user
 
-@pytest.fixture(scope="function")
-def auth_headers(client, test_user):
-    """Get authentication headers. Depends on test_user to ensure user exists."""
-    response = client.post(
-        "/api/v1/auth/login",
-        data={
-            "username": test_user.username,  # Use the test_user's username
-            "password": "testpass123"         # Use the known password
-        }
+@pytest.fixture(scope="session")
+def auth_headers(test_user):
+    """Get authentication headers for test_user, signed once per session."""
+    token = create_access_token(
+        data={"sub": test_user.username},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
-    
-    # Check if login was successful
-    assert response.status_code == 200, f"Login failed: {response.text}"
-    data = response.json()
-    assert "access_token" in data, f"No access_token in response: {data}"
-    
-    token = data["access_token"]
     return {"Authorization": f"Bearer {token}"}
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_resume():
     return """
     John Doe - Software Engineer
@@ -77,7 +134,7 @@ def sample_resume():
     Experience: 5 years developing web applications
     """
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_job_description():
     return """
     Looking for Full Stack Developer
@@ -35,3 +35,37 @@ def test_resume_optimization():
     assert "keyword_optimization" in suggestions
     assert "action_verb_suggestions" in suggestions
     assert "overall_score" in suggestions
+
+def test_score_resumes_batch_matches_single_scores():
+    """Batch scores equal the per-resume overall score."""
+    optimizer = ResumeOptimizer()
+    job_description = "Need Python developer with Docker and AWS experience"
+    resumes = [
+        "I worked on Python projects",
+        "Experience: built Docker images on AWS. Skills: Python, SQL. Education: BSc",
+        ""
+    ]
+    
+    scores = optimizer.score_resumes_batch(resumes, job_description, n_process=1)
+    
+    assert scores == [
+        optimizer.optimize_resume(resume, job_description)["overall_score"]
+        for resume in resumes
+    ]
+
+def test_weak_verbs_match_whole_words():
+    """Weak verbs are only reported as whole words."""
+    optimizer = ResumeOptimizer()
+    
+    suggestions = optimizer._suggest_action_verbs("Networked services and worked with teams that were remote")
+    
+    assert suggestions["weak_verbs_found"] == ["worked", "were"]
+
+def test_keyword_density_counts_whole_words():
+    """Keywords are not counted inside longer words."""
+    optimizer = ResumeOptimizer()
+    
+    density = optimizer._calculate_keyword_density("JavaScript and Java with node.js", ["java", "node.js"])
+    
+    # 2 of 6 words: javascript, and, java, with, node, js
+    assert density == 33.33
@@ -0,0 +1,38 @@
+"""Tests for monitoring service."""
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from app.models.user import User, AnalysisHistory
+from app.services.monitoring import MonitoringService
+
+def test_weekly_stats_bulk(db_connection):
+    """Test weekly stats are grouped per user and skip analyses older than a week."""
+    db = Session(bind=db_connection)
+    alice = User(email="alice@example.com", username="alice", hashed_password="x")
+    bob = User(email="bob@example.com", username="bob", hashed_password="x")
+    idle = User(email="idle@example.com", username="idle", hashed_password="x")
+    db.add_all([alice, bob, idle])
+    db.flush()
+    
+    now = datetime.now()
+    for user, match, age in [
+        (alice, 60.0, 1),
+        (alice, 80.0, 2),
+        (alice, 95.0, 10),  # outside the week
+        (bob, 42.25, 3),
+    ]:
+        db.add(AnalysisHistory(
+            user_id=user.id,
+            resume_text="resume",
+            job_description="job",
+            match_percentage=match,
+            skill_analysis={},
+            created_at=now - timedelta(days=age)
+        ))
+    db.flush()
+    
+    stats = MonitoringService.weekly_stats_bulk([alice.id, bob.id, idle.id], db)
+    
+    assert stats[alice.id] == {"analyses_count": 2, "avg_match": 70.0, "best_match": 80.0, "skills_improved": 0}
+    assert stats[bob.id] == {"analyses_count": 1, "avg_match": 42.2, "best_match": 42.2, "skills_improved": 0}
+    assert stats[idle.id] == {"analyses_count": 0, "avg_match": 0, "best_match": 0, "skills_improved": 0}
+    db.close()
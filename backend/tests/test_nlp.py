@@ -1,10 +1,11 @@
 """Tests for NLP service."""
 import pytest
-from app.services.nlp_service import NLPService
+from app.services.nlp_service import get_nlp_service
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def nlp_service():
-    return NLPService()
+    """The shared NLPService; loading the spaCy model once is enough."""
+    return get_nlp_service()
 
 def test_extract_skills_advanced(nlp_service):
     """Test advanced skill extraction."""
@@ -31,6 +32,28 @@ def test_extract_experience_level(nlp_service):
     text3 = "3 years of professional experience"
     assert nlp_service.extract_experience_level(text3) == "Mid-level"
 
+def test_extract_entities_reports_one_name_per_technology(nlp_service):
+    """Test dotted skill variants are reported under their base skill."""
+    text = "Built apps with React.js and React, APIs in Node.js and Python."
+    entities = nlp_service.extract_entities(text)
+    
+    assert entities["technologies"] == ["react", "node", "python"]
+
+def test_batch_similarity_matches_pairwise(nlp_service):
+    """Test batch scores agree with calculate_semantic_similarity."""
+    text = "Python developer building REST APIs with FastAPI"
+    others = [text, "", "Frontend engineer working with React and TypeScript"]
+    scores = nlp_service.batch_similarity(text, others)
+    
+    assert scores.shape == (3,)
+    assert scores[0] == 1.0
+    assert scores[1] == 0.0
+    for other, score in zip(others, scores):
+        assert score == pytest.approx(nlp_service.calculate_semantic_similarity(text, other), abs=1e-5)
+    
+    assert nlp_service.batch_similarity("", [text]).tolist() == [0.0]
+    assert nlp_service.batch_similarity(text, []).shape == (0,)
+
 def test_extract_key_phrases(nlp_service):
     """Test key phrase extraction."""
     text = "Full stack developer with expertise in cloud computing and microservices architecture"
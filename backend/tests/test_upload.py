@@ -3,14 +3,7 @@ import pytest
 from fastapi import status
 import io
 
-def test_pdf_parser():
-    """Test PDF parsing functionality with valid resume text."""
-    from app.services.pdf_parser import PDFParser
-    
-    parser = PDFParser()
-    
-    # Test with a valid resume-like text
-    sample_text = """John Doe
+_SAMPLE_TEXT = """John Doe
     Software Engineer
     john.doe@email.com
     123-456-7890
@@ -28,26 +21,109 @@ def test_pdf_parser():
     SKILLS
     Python, JavaScript, React, Docker, AWS
     """
+
+_VALID_RESUME_BYTES = b"""John Doe
+    Software Engineer
+    john.doe@example.com
+    555-123-4567
+    
+    EXPERIENCE:
+    Senior Developer at Tech Company (2020-Present)
+    - Built scalable web applications using Python and React
+    - Led a team of 5 developers
+    - Implemented CI/CD pipelines
+    
+    EDUCATION:
+    Bachelor of Science in Computer Science
+    University of Technology, 2019
+    
+    SKILLS:
+    Python, JavaScript, React, Docker, AWS, PostgreSQL
+    """
+
+_TEMPLATE_DATA = {
+    "name": "Test User",
+    "email": "test@example.com",
+    "phone": "123-456-7890",
+    "location": "Test City, TS",
+    "skills": ["Python", "JavaScript"],
+    "summary": "Test summary",
+    "experience": [
+        {
+            "title": "Software Engineer",
+            "company": "Test Company",
+            "start_date": "2020",
+            "end_date": "Present",
+            "description": "Developed software"
+        }
+    ],
+    "education": [
+        {
+            "degree": "Bachelor of Science",
+            "school": "Test University",
+            "graduation_date": "2019"
+        }
+    ]
+}
+
+@pytest.mark.parametrize("sample_text,expected_valid,min_confidence,max_confidence", [
+    (_SAMPLE_TEXT, True, 50, 100),
+    ("Just a short note", False, 0, 49),
+], ids=["resume", "short-note"])
+def test_pdf_parser(sample_text, expected_valid, min_confidence, max_confidence):
+    """Test resume validation of extracted text."""
+    from app.services.pdf_parser import PDFParser
+    
+    parser = PDFParser()
     
     validation = parser.validate_resume_content(sample_text)
     
-    assert validation["is_valid"] == True
-    assert validation["confidence"] >= 50
-    assert len(validation["issues"]) == 0
+    assert validation["is_valid"] == expected_valid
+    assert min_confidence <= validation["confidence"] <= max_confidence
+    assert (len(validation["issues"]) == 0) == expected_valid
 
-def test_upload_endpoint_validation(client):
+async def test_upload_endpoint_validation(async_client):
     """Test upload endpoint validation without authentication."""
     # The upload endpoint requires authentication
-    response = client.post(
+    response = await async_client.post(
         "/api/v1/upload/resume",
         files={"file": ("test.exe", b"content", "application/x-msdownload")}
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
-def test_upload_endpoint_with_auth(client, test_user, auth_headers):
+def test_upload_rejects_oversized_content_length(client):
+    """Test an upload whose declared size exceeds the limit is rejected up front."""
+    response = client.post(
+        "/api/v1/upload/resume",
+        files={"file": ("resume.txt", b"x" * (11 * 1024 * 1024), "text/plain")},
+        headers={"Origin": "http://localhost:3000"}
+    )
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert response.json()["detail"] == "Upload exceeds the size limit"
+    assert "access-control-allow-origin" in response.headers
+
+def test_upload_rejects_oversized_chunked_body(client):
+    """Test a chunked upload is cut off once it streams past the limit."""
+    def body():
+        yield b'--xx\r\nContent-Disposition: form-data; name="file"; filename="resume.txt"\r\n'
+        yield b'Content-Type: text/plain\r\n\r\n'
+        for _ in range(12):
+            yield b"x" * (1024 * 1024)
+        yield b"\r\n--xx--\r\n"
+    
+    response = client.post(
+        "/api/v1/upload/resume",
+        content=body(),
+        headers={"Content-Type": "multipart/form-data; boundary=xx"}
+    )
+    assert "content-length" not in response.request.headers
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert response.json()["detail"] == "Upload exceeds the size limit"
+
+async def test_upload_endpoint_with_auth(async_client, test_user, auth_headers):
     """Test upload endpoint validation with authentication."""
     # Test with invalid file type
-    response = client.post(
+    response = await async_client.post(
         "/api/v1/upload/resume",
         files={"file": ("test.exe", b"content", "application/x-msdownload")},
         headers=auth_headers
@@ -56,7 +132,7 @@ def test_upload_endpoint_with_auth(client, test_user, auth_headers):
     
     # Test with invalid PDF content - should return 422 not 500
     invalid_pdf_content = b"This is not a valid PDF"
-    response = client.post(
+    response = await async_client.post(
         "/api/v1/upload/resume",
         files={"file": ("resume.pdf", invalid_pdf_content, "application/pdf")},
         headers=auth_headers
@@ -66,28 +142,9 @@ def test_upload_endpoint_with_auth(client, test_user, auth_headers):
     assert "Could not extract text" in response.json()["detail"]
     
     # Test with valid text file
-    text_content = b"""John Doe
-    Software Engineer
-    john.doe@example.com
-    555-123-4567
-    
-    EXPERIENCE:
-    Senior Developer at Tech Company (2020-Present)
-    - Built scalable web applications using Python and React
-    - Led a team of 5 developers
-    - Implemented CI/CD pipelines
-    
-    EDUCATION:
-    Bachelor of Science in Computer Science
-    University of Technology, 2019
-    
-    SKILLS:
-    Python, JavaScript, React, Docker, AWS, PostgreSQL
-    """
-    
-    response = client.post(
+    response = await async_client.post(
         "/api/v1/upload/resume",
-        files={"file": ("resume.txt", text_content, "text/plain")},
+        files={"file": ("resume.txt", _VALID_RESUME_BYTES, "text/plain")},
         headers=auth_headers
     )
     # Should successfully process text file
@@ -98,45 +155,92 @@ def test_upload_endpoint_with_auth(client, test_user, auth_headers):
     assert "John Doe" in data["text"]
     assert data["character_count"] > 0
 
-def test_template_generation():
-    """Test resume template generation."""
+async def test_upload_pdf_sent_as_text_plain(async_client, auth_headers):
+    """Test a PDF uploaded as text/plain is parsed rather than decoded as text."""
+    from fpdf import FPDF
+    
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=11)
+    for line in _VALID_RESUME_BYTES.decode().splitlines():
+        pdf.cell(0, 6, line.strip(), new_x="LMARGIN", new_y="NEXT")
+    
+    response = await async_client.post(
+        "/api/v1/upload/resume",
+        files={"file": ("resume.txt", bytes(pdf.output()), "text/plain")},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    text = response.json()["text"]
+    assert "John Doe" in text
+    assert "Senior Developer at Tech Company" in text
+    assert "%PDF" not in text
+    assert "endobj" not in text
+
+async def test_upload_repeated_textless_pdf_skips_extraction(async_client, auth_headers, monkeypatch):
+    """Test a PDF with no extractable text is only parsed on its first upload."""
+    from collections import OrderedDict
+    from fpdf import FPDF
+    from app.services import pdf_parser
+    
+    monkeypatch.setattr(pdf_parser, "_unreadable_pdfs", OrderedDict())
+    calls = []
+    extract = pdf_parser.PDFParser._extract_with_pdfium
+    monkeypatch.setattr(
+        pdf_parser.PDFParser, "_extract_with_pdfium",
+        lambda self, pdf_file: calls.append(pdf_file) or extract(self, pdf_file)
+    )
+    
+    pdf = FPDF()
+    pdf.add_page()
+    blank_pdf = bytes(pdf.output())
+    for _ in range(2):
+        response = await async_client.post(
+            "/api/v1/upload/resume",
+            files={"file": ("blank.pdf", blank_pdf, "application/pdf")},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len(calls) == 1
+    
+    # Files the extractors cannot parse are remembered as well
+    for _ in range(2):
+        assert pdf_parser.get_pdf_parser().extract_text_from_pdf(b"This is not a valid PDF") is None
+    assert len(calls) == 2
+    
+    # Unexpected errors may be transient, so those files are retried
+    def fail(self, pdf_file):
+        calls.append(pdf_file)
+        raise MemoryError
+    
+    monkeypatch.setattr(pdf_parser.PDFParser, "_extract_with_pdfium", fail)
+    for _ in range(2):
+        assert pdf_parser.get_pdf_parser().extract_text_from_pdf(b"%PDF-1.4 truncated") is None
+    assert len(calls) == 4
+
+@pytest.fixture(scope="session")
+def rendered_templates():
+    """Render the modern HTML and ATS text resumes once for all assertions."""
     from app.services.resume_templates import TemplateManager
     
     manager = TemplateManager()
-    
-    data = {
-        "name": "Test User",
-        "email": "test@example.com",
-        "phone": "123-456-7890",
-        "location": "Test City, TS",
-        "skills": ["Python", "JavaScript"],
-        "summary": "Test summary",
-        "experience": [
-            {
-                "title": "Software Engineer",
-                "company": "Test Company",
-                "start_date": "2020",
-                "end_date": "Present",
-                "description": "Developed software"
-            }
-        ],
-        "education": [
-            {
-                "degree": "Bachelor of Science",
-                "school": "Test University",
-                "graduation_date": "2019"
-            }
-        ]
+    text = manager.generate_resume("ats", _TEMPLATE_DATA, "text")
+    return {
+        "html": manager.generate_resume("modern", _TEMPLATE_DATA, "html"),
+        "text": text,
+        "text_upper": text.upper()
     }
-    
+
+def test_template_generation(rendered_templates):
+    """Test resume template generation."""
     # Test HTML generation for modern template
-    html = manager.generate_resume("modern", data, "html")
+    html = rendered_templates["html"]
     assert "Test User" in html
     assert "test@example.com" in html
     assert "Python" in html
     
     # Test text generation for ats template
-    text = manager.generate_resume("ats", data, "text")
-    assert "TEST USER" in text.upper()
+    text = rendered_templates["text"]
+    assert "TEST USER" in rendered_templates["text_upper"]
     assert "test@example.com" in text
     assert "Python" in text
\ No newline at end of file